@@ -1,24 +1,148 @@
-from typing import List, Dict, Any, Optional
-from datetime import datetime
+import logging
+import time
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from typing import List, Dict, Any, Iterator, Optional, Set, Tuple
+from datetime import timedelta
 from ..models.player import Player, Role, PlayerStatus, Team
+from ..models.hallucination_models import SpeechHistoryError
 from ..utils.speech_history_tracker import SpeechHistoryTracker
 
 
+# Strings shared by every context payload
+_ALIVE = PlayerStatus.ALIVE.value
+_DEAD = PlayerStatus.DEAD.value
+_UNKNOWN_ROLE = "未知"
+_VILLAGER_DISPLAY = "村民"
+_WOLF_DISPLAY = "狼人"
+
+
+def _context_instructions(first_round: bool, has_last_words: bool, has_history: bool) -> Dict[str, Optional[str]]:
+    return {
+        "reminder": "这是真实的游戏信息，请基于实际发生的事件进行推理",
+        "first_round_note": f"这是第一轮游戏，{'但有死亡玩家的遗言信息需要重点关注' if has_last_words else '没有前夜的查验结果或互动'}" if first_round else None,
+        "speech_note": "发言历史包含实际发言内容，如显示'尚未发言'则该玩家确实未发言",
+        "last_words_emphasis": "死亡玩家的遗言包含重要信息，请仔细分析" if has_last_words else None,
+        "historical_note": "历史信息包含之前轮次的重要内容，请结合历史信息进行分析" if has_history else None
+    }
+
+
+# 各身份禁止声称的身份 (狼人允许策略性假跳)
+_FORBIDDEN_CLAIMS = {
+    Role.VILLAGER: ("预言家", "女巫", "猎人", "狼人"),
+    Role.WEREWOLF: (),
+    Role.SEER: ("女巫", "猎人", "狼人"),
+    Role.WITCH: ("预言家", "猎人", "狼人"),
+    Role.HUNTER: ("预言家", "女巫", "狼人"),
+}
+
+# 可用信息类型，按 (是否有历史轮次, 是否有遗言) 选择
+_BASE_AVAILABLE = ("玩家列表和编号", "夜晚死亡公告")
+_LAST_WORDS_AVAILABLE = ("死亡玩家遗言",)
+_HISTORY_AVAILABLE = ("历史发言记录", "历史投票结果", "已淘汰玩家信息")
+_AVAILABLE_INFORMATION = {
+    (False, False): _BASE_AVAILABLE,
+    (False, True): _BASE_AVAILABLE + _LAST_WORDS_AVAILABLE,
+    (True, False): _BASE_AVAILABLE + _HISTORY_AVAILABLE,
+    (True, True): _BASE_AVAILABLE + _LAST_WORDS_AVAILABLE + _HISTORY_AVAILABLE,
+}
+
+_BASE_DISCLAIMERS = (
+    "只能基于真实发生的游戏事件进行推理",
+    "不能编造不存在的玩家互动或发言内容",
+    "身份声明必须符合游戏规则和策略需要",
+)
+_FIRST_ROUND_DISCLAIMERS = (
+    "第一轮游戏没有前夜信息可供分析",
+    "不能引用不存在的历史互动或查验结果",
+    "应该基于基础游戏规则进行推理",
+)
+
+# 第一轮没有历史信息 (shared, read-only)
+_EMPTY_HISTORICAL_CONTEXT = {
+    "has_history": False,
+    "previous_rounds": [],
+    "all_last_words": [],
+    "voting_history": [],
+    "eliminated_players": []
+}
+
+# 第一轮白天上下文的固定约束 (shared, read-only)
+_FIRST_ROUND_CONSTRAINTS = {
+    "no_previous_night_info": True,
+    "no_interaction_history": True,
+    "focus_on_basic_logic": True,
+    "available_info_only": [
+        "夜晚死亡公告",
+        "死亡玩家遗言（如果有）",
+        "玩家列表和编号"
+    ],
+    "forbidden_references": [
+        "前夜查验结果",
+        "复杂互动分析",
+        "历史行为模式",
+        "投票历史"
+    ]
+}
+_FIRST_ROUND_GUIDANCE = {
+    "analysis_focus": "遗言信息和基础游戏规则",
+    "avoid_topics": ["前夜查验", "复杂互动", "历史行为"],
+    "recommended_approach": "谨慎分析，基于事实发言"
+}
+
+# Day context instructions keyed by (first_round, has_last_words, has_history); shared, read-only
+_CONTEXT_INSTRUCTIONS = {
+    (first_round, has_last_words, has_history): _context_instructions(first_round, has_last_words, has_history)
+    for first_round in (True, False)
+    for has_last_words in (True, False)
+    for has_history in (True, False)
+}
+
+
 class VoteRecord:
+    __slots__ = ("round_num", "voter_id", "target_id")
+    
     def __init__(self, round_num: int, voter_id: int, target_id: int):
         self.round_num = round_num
         self.voter_id = voter_id
         self.target_id = target_id
-        self.timestamp = datetime.now()
 
 
 class GameState:
     def __init__(self):
+        self.logger = logging.getLogger(__name__)
         self.players: List[Player] = []
+        
+        # Player partitions, maintained only by add_player/kill_player so the
+        # getters below don't rescan self.players on every call
+        self._by_id: Dict[int, Player] = {}
+        self._id_to_name: Dict[int, str] = {}
+        self._role_values: Dict[int, str] = {}  # player_id -> role.value, roles never change mid-game
+        self._alive: List[Player] = []
+        self._alive_order: List[int] = []  # ids of self._alive, same (sorted) order
+        self._alive_ids: Set[int] = set()
+        self._dead: List[Player] = []
+        self._eliminated_entries: Dict[int, Dict[str, Any]] = {}  # player_id -> eliminated_players entry, fixed at death
+        self._by_role: Dict[Role, List[Player]] = defaultdict(list)
+        self._by_team: Dict[Team, List[Player]] = defaultdict(list)
+        self._alive_wolf_count = 0
+        self._alive_villager_count = 0
+        # Cached context entries per player: player_id -> view -> entry.
+        # Only "status" ever changes, and kill_player keeps it current.
+        self._player_entries: Dict[int, Dict[str, Dict[str, Any]]] = {}
+        # Entry lists shared by context builders until the roster changes:
+        # (group, view) -> entries, valid while the version matches
+        self._snapshot_version = 0
+        self._snapshot: Tuple[int, Dict[Tuple[str, str], List[Dict[str, Any]]]] = (-1, {})
+        # Day context parts shared by every speaker, see _get_day_shared_context
+        self._day_shared_context: Tuple[Optional[Tuple], Dict[str, Any]] = (None, {})
         self.current_round = 0
         self.phase = "setup"  # setup, night, day, voting, ended
-        self.game_start_time = datetime.now()
+        self.game_start_time = time.monotonic()
         self.vote_records: List[VoteRecord] = []
+        # Votes and running tallies bucketed by round, updated in record_vote
+        self._votes_by_round: Dict[int, List[VoteRecord]] = defaultdict(list)
+        self._vote_count_by_round: Dict[int, Counter] = defaultdict(Counter)
         
         # Night events tracking
         self.night_actions: Dict[int, Dict[str, Any]] = {}  # player_id -> action
@@ -42,36 +166,58 @@ class GameState:
         # Day context information (legacy - will be gradually replaced by speech_history_tracker)
         self.last_words_context: List[Dict[str, Any]] = []
         self.day_speeches: Dict[int, List[Dict[str, Any]]] = {}  # round -> [speech_records]
-        self.last_words_printed: Dict[int, bool] = {}  # round -> printed_flag
+        self._day_speech_index: Dict[int, Dict[int, Dict[str, Any]]] = {}  # round -> player_id -> first speech_record
+        # round -> speech entries for historical context (truncated once, at record time)
+        self._historical_speeches: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+        self._round_summaries: Dict[int, Dict[str, Any]] = {}  # completed round -> previous_rounds entry
         self.all_last_words: List[Dict[str, Any]] = []  # 所有轮次的遗言历史
+        self._last_words_keys: Set[Tuple[int, int]] = set()  # (round, player_id) already in all_last_words
         self.voting_history: List[Dict[str, Any]] = []  # 投票历史记录
         
     def add_player(self, player: Player):
         """Add a player to the game"""
         self.players.append(player)
+        self._by_id[player.id] = player
+        self._id_to_name[player.id] = player.name
+        self._role_values[player.id] = player.role.value
+        self._by_role[player.role].append(player)
+        self._by_team[player.team].append(player)
+        if player.status is PlayerStatus.ALIVE:
+            i = bisect_left(self._alive_order, player.id)
+            self._alive_order.insert(i, player.id)
+            self._alive.insert(i, player)
+            self._alive_ids.add(player.id)
+            self._adjust_alive_counts(player, 1)
+        else:
+            self._dead.append(player)
+            self._eliminated_entries[player.id] = self._build_eliminated_entry(player, 'unknown')
+        
+        self._player_entries[player.id] = self._build_player_entries(player)
+        self._snapshot_version += 1
     
     def get_alive_players(self) -> List[Player]:
         """Get all alive players"""
-        return [p for p in self.players if p.is_alive()]
+        return list(self._alive)
     
     def get_dead_players(self) -> List[Player]:
         """Get all dead players"""
-        return [p for p in self.players if not p.is_alive()]
+        return list(self._dead)
     
     def get_player_by_id(self, player_id: int) -> Optional[Player]:
         """Get player by ID"""
-        for player in self.players:
-            if player.id == player_id:
-                return player
-        return None
+        return self._by_id.get(player_id)
+    
+    def get_player_names(self) -> Dict[int, str]:
+        """Get the player ID -> name mapping (shared, do not modify)"""
+        return self._id_to_name
     
     def get_players_by_role(self, role: Role) -> List[Player]:
         """Get all players with a specific role"""
-        return [p for p in self.players if p.role == role]
+        return list(self._by_role.get(role, ()))
     
     def get_alive_players_by_role(self, role: Role) -> List[Player]:
         """Get all alive players with a specific role"""
-        return [p for p in self.players if p.role == role and p.is_alive()]
+        return [p for p in self._by_role.get(role, ()) if p.id in self._alive_ids]
     
     def get_wolf_players(self) -> List[Player]:
         """Get all wolf players"""
@@ -83,54 +229,86 @@ class GameState:
     
     def get_villager_players(self) -> List[Player]:
         """Get all non-wolf players"""
-        return [p for p in self.players if p.team == Team.VILLAGER]
+        return list(self._by_team.get(Team.VILLAGER, ()))
     
     def get_alive_villager_players(self) -> List[Player]:
         """Get all alive non-wolf players"""
-        return [p for p in self.players if p.team == Team.VILLAGER and p.is_alive()]
+        return [p for p in self._by_team.get(Team.VILLAGER, ()) if p.id in self._alive_ids]
     
     def kill_player(self, player_id: int) -> bool:
         """Kill a player and return if successful"""
         player = self.get_player_by_id(player_id)
-        if player and player.is_alive():
+        if player and player_id in self._alive_ids:
             player.kill()
+            # Locate by id instead of list.remove(), which compares Player
+            # models field by field; order must stay seating order for day_phase
+            i = bisect_left(self._alive_order, player_id)
+            del self._alive_order[i]
+            del self._alive[i]
+            self._alive_ids.discard(player_id)
+            self._adjust_alive_counts(player, -1)
+            # Keep dead players in seating (id) order, same as self.players
+            self._dead.append(player)
+            self._dead.sort(key=lambda p: p.id)
+            self._eliminated_entries[player_id] = self._build_eliminated_entry(player, self.current_round)
+            for entry in self._player_entries[player_id].values():
+                if "status" in entry:
+                    entry["status"] = _DEAD
+            self._snapshot_version += 1
             return True
         return False
     
+    def _build_eliminated_entry(self, player: Player, elimination_round: Any) -> Dict[str, Any]:
+        """Build the historical context entry of a dead player"""
+        return {
+            "player_id": player.id,
+            "player_name": player.name,
+            "role": self._role_values[player.id],
+            "elimination_round": elimination_round
+        }
+    
+    def _adjust_alive_counts(self, player: Player, delta: int):
+        """Update the alive wolf/villager counters used by check_victory_conditions"""
+        if player.role is Role.WEREWOLF:
+            self._alive_wolf_count += delta
+        if player.team is Team.VILLAGER:
+            self._alive_villager_count += delta
+    
     def record_vote(self, voter_id: int, target_id: int):
         """Record a vote"""
         vote = VoteRecord(self.current_round, voter_id, target_id)
         self.vote_records.append(vote)
+        self._votes_by_round[self.current_round].append(vote)
+        self._vote_count_by_round[self.current_round][target_id] += 1
     
     def get_votes_this_round(self) -> List[VoteRecord]:
         """Get all votes for current round"""
-        return [v for v in self.vote_records if v.round_num == self.current_round]
+        return list(self._votes_by_round.get(self.current_round, ()))
     
     def get_vote_count(self) -> Dict[int, int]:
         """Get vote count for current round"""
-        votes = self.get_votes_this_round()
-        vote_count = {}
-        for vote in votes:
-            vote_count[vote.target_id] = vote_count.get(vote.target_id, 0) + 1
-        return vote_count
+        return dict(self._vote_count_by_round.get(self.current_round, ()))
     
     def get_most_voted_player(self) -> Optional[int]:
         """Get the player with most votes (for elimination)"""
-        vote_count = self.get_vote_count()
+        vote_count = self._vote_count_by_round.get(self.current_round)
         if not vote_count:
             return None
         
-        max_votes = max(vote_count.values())
-        most_voted = [pid for pid, votes in vote_count.items() if votes == max_votes]
+        best_id, best_count, tied = None, -1, False
+        for pid, count in vote_count.items():
+            if count > best_count:
+                best_id, best_count, tied = pid, count, False
+            elif count == best_count:
+                tied = True
         
-        # Return the first if there's a tie
-        return most_voted[0] if len(most_voted) == 1 else None
+        # No one is eliminated on a tie
+        return None if tied else best_id
     
     def check_victory_conditions(self) -> Dict[str, Any]:
         """Check if game has ended and return result"""
-        alive_wolves = len(self.get_alive_wolf_players())
-        alive_villagers = len(self.get_alive_villager_players())
-        alive_players = len(self.get_alive_players())
+        alive_wolves = self._alive_wolf_count
+        alive_villagers = self._alive_villager_count
         
         # Wolf victory conditions
         if alive_wolves == 0:
@@ -140,10 +318,10 @@ class GameState:
             return {"game_over": True, "winner": "werewolves", "reason": "狼人人数大于等于好人"}
         
         # Check if witch has no potions left and it's 1v1
-        witch = self.get_players_by_role(Role.WITCH)
-        if witch and not witch[0].is_alive():
-            witch_potions_used = not witch[0].witch_potions["heal"] and not witch[0].witch_potions["poison"]
-            if witch_potions_used and alive_wolves == 1 and alive_villagers == 1:
+        witch = self._by_role.get(Role.WITCH)
+        if witch and witch[0].id not in self._alive_ids:
+            w = witch[0]
+            if not w.heal_available and not w.poison_available and alive_wolves == 1 and alive_villagers == 1:
                 return {"game_over": True, "winner": "werewolves", "reason": "女巫药物已用完，1v1狼人胜利"}
         
         # Check max rounds
@@ -154,17 +332,14 @@ class GameState:
     
     def get_game_summary(self) -> Dict[str, Any]:
         """Get current game summary"""
-        alive_players = self.get_alive_players()
-        dead_players = self.get_dead_players()
-        
         return {
             "round": self.current_round,
             "phase": self.phase,
-            "alive_players": [{"id": p.id, "name": p.name, "role": p.role.value} for p in alive_players],
-            "dead_players": [{"id": p.id, "name": p.name, "role": p.role.value} for p in dead_players],
-            "alive_wolves": len(self.get_alive_wolf_players()),
-            "alive_villagers": len(self.get_alive_villager_players()),
-            "game_duration": str(datetime.now() - self.game_start_time)
+            "alive_players": self._get_shared_entries("alive", "summary"),
+            "dead_players": self._get_shared_entries("dead", "summary"),
+            "alive_wolves": self._alive_wolf_count,
+            "alive_villagers": self._alive_villager_count,
+            "game_duration": str(timedelta(seconds=time.monotonic() - self.game_start_time))
         }
     
     def next_round(self):
@@ -172,7 +347,9 @@ class GameState:
         # 保存当前轮次的遗言到历史记录
         if self.last_words_context:
             for last_word in self.last_words_context:
-                if last_word not in self.all_last_words:
+                key = (last_word.get("round", self.current_round), last_word["player"])
+                if key not in self._last_words_keys:
+                    self._last_words_keys.add(key)
                     self.all_last_words.append(last_word)
         
         self.current_round += 1
@@ -195,50 +372,69 @@ class GameState:
         if not player:
             return {}
         
-        alive_players = self.get_alive_players()
-        dead_players = self.get_dead_players()
-        
-        # Get player names mapping
-        player_names = {p.id: p.name for p in self.players}
-        
-        if context_type == "seer" and player.role == Role.SEER:
+        if context_type == "seer" and player.role is Role.SEER:
             return self._get_seer_context(player)
-        elif context_type == "wolf" and player.role == Role.WEREWOLF:
+        elif context_type == "wolf" and player.role is Role.WEREWOLF:
             return self._get_wolf_context(player)
-        elif context_type == "witch" and player.role == Role.WITCH:
+        elif context_type == "witch" and player.role is Role.WITCH:
             return self._get_witch_context(player)
         elif context_type == "day":
             return self._get_day_context(player)
         else:
             return self._get_basic_context(player)
     
+    def _build_player_entries(self, player: Player) -> Dict[str, Dict[str, Any]]:
+        """Build the per-player entries used in contexts, keyed by view"""
+        status = _ALIVE if player.id in self._alive_ids else _DEAD
+        return {
+            "brief": {"id": player.id, "name": player.name},
+            "summary": {"id": player.id, "name": player.name, "role": self._role_values[player.id]},
+            "status": {"id": player.id, "name": player.name, "status": status},
+            "full": {"id": player.id, "name": player.name, "status": status, "role": self._role_values[player.id]},
+            "wolf": {
+                "id": player.id,
+                "name": player.name,
+                "status": status,
+                "role_display": _WOLF_DISPLAY if player.role is Role.WEREWOLF else _VILLAGER_DISPLAY
+            },
+            # 白天阶段不暴露角色
+            "public": {"id": player.id, "name": player.name, "status": status, "role_display": _UNKNOWN_ROLE},
+            # 夜间目标列表 (预言家待查验 / 狼人可击杀)
+            "seer_target": {"id": player.id, "name": player.name, "role_display": _UNKNOWN_ROLE, "status": status},
+            "wolf_target": {"id": player.id, "name": player.name, "role_display": _VILLAGER_DISPLAY, "status": status},
+        }
+    
+    def _player_entries_for(self, players: List[Player], view: str) -> List[Dict[str, Any]]:
+        """Get the cached entries of a view for players
+        
+        The entries are shared between contexts and must be treated as read-only.
+        """
+        return [self._player_entries[p.id][view] for p in players]
+    
+    def _get_shared_entries(self, group: str, view: str) -> List[Dict[str, Any]]:
+        """Get the entries of a view for "alive", "dead" or "all" players
+        
+        Built once per roster change and shared between contexts, read-only.
+        """
+        version, cache = self._snapshot
+        if version != self._snapshot_version:
+            cache = {}
+            self._snapshot = (self._snapshot_version, cache)
+        entries = cache.get((group, view))
+        if entries is None:
+            players = {"alive": self._alive, "dead": self._dead, "all": self.players}[group]
+            entries = cache[(group, view)] = self._player_entries_for(players, view)
+        return entries
+    
     def _get_seer_context(self, player: Player) -> Dict[str, Any]:
         """Private context for seer"""
-        alive_players = self.get_alive_players()
-        dead_players = self.get_dead_players()
+        alive_players = self._alive
         
         # Build unchecked players list with names and status
         unchecked_players = [p for p in alive_players 
                            if p.id != player.id and p.id not in player.seer_checks]
         
-        unchecked_info = []
-        for target_player in unchecked_players:
-            unchecked_info.append({
-                "id": target_player.id,
-                "name": target_player.name,
-                "role_display": "未知",
-                "status": "alive"
-            })
-        
-        # Include all players with their current status
-        all_players_info = []
-        for p in self.players:
-            all_players_info.append({
-                "id": p.id,
-                "name": p.name,
-                "status": "alive" if p.is_alive() else "dead",
-                "role": p.role.value
-            })
+        unchecked_info = self._player_entries_for(unchecked_players, "seer_target")
 
         return {
             "context_type": "seer_private",
@@ -246,34 +442,23 @@ class GameState:
             "phase": self.phase,
             "unchecked_players": unchecked_info,
             "seer_checks": player.seer_checks,
-            "all_players": all_players_info,
-            "alive_players": [{"id": p.id, "name": p.name} for p in alive_players],
-            "dead_players": [{"id": p.id, "name": p.name} for p in dead_players],
+            "all_players": self._get_shared_entries("all", "full"),
+            "alive_players": self._get_shared_entries("alive", "brief"),
+            "dead_players": self._get_shared_entries("dead", "brief"),
             "instruction": "你必须选择一名玩家进行查验，使用CHECK: [ID]格式"
         }
     
     def _get_wolf_context(self, player: Player) -> Dict[str, Any]:
         """Wolf team shared context -狼人看不到好人身份"""
-        alive_players = self.get_alive_players()
-        dead_players = self.get_dead_players()
-        wolf_team = [p for p in alive_players if p.role == Role.WEREWOLF]
-        non_wolf_players = [p for p in alive_players if p.role != Role.WEREWOLF]
+        alive_players = self._alive
+        wolf_team = [p for p in alive_players if p.role is Role.WEREWOLF]
+        non_wolf_players = [p for p in alive_players if p.role is not Role.WEREWOLF]
         
-        wolf_info = [{"id": p.id, "name": p.name, "status": "alive"} for p in wolf_team]
+        wolf_info = self._player_entries_for(wolf_team, "status")
         
         # 狼人视角：好人都是"村民"，看不到真实身份
-        target_info = [{"id": p.id, "name": p.name, "role_display": "村民", "status": "alive"} for p in non_wolf_players]
+        target_info = self._player_entries_for(non_wolf_players, "wolf_target")
         target_ids = [p.id for p in non_wolf_players]
-        
-        # Include all players with their current status
-        all_players_info = []
-        for p in self.players:
-            all_players_info.append({
-                "id": p.id,
-                "name": p.name,
-                "status": "alive" if p.is_alive() else "dead",
-                "role_display": "狼人" if p.role == Role.WEREWOLF else "村民"
-            })
 
         return {
             "context_type": "wolf_team_private",
@@ -281,118 +466,81 @@ class GameState:
             "phase": self.phase,
             "wolf_team": wolf_info,
             "available_targets": target_ids,
-            "all_players": all_players_info,
-            "alive_players": [{"id": p.id, "name": p.name} for p in alive_players],
-            "dead_players": [{"id": p.id, "name": p.name} for p in dead_players],
+            "all_players": self._get_shared_entries("all", "wolf"),
+            "alive_players": self._get_shared_entries("alive", "brief"),
+            "dead_players": self._get_shared_entries("dead", "brief"),
             "target_info": target_info,  # Keep for display purposes
             "instruction": "狼人团队必须统一选择击杀目标，使用KILL: [ID]格式"
         }
     
     def _get_witch_context(self, player: Player) -> Dict[str, Any]:
         """Private context for witch"""
-        alive_players = self.get_alive_players()
-        dead_players = self.get_dead_players()
+        alive_players = self._alive
         
         # Get killed player info
         killed_player = None
-        if hasattr(self, 'wolf_kill_target') and self.wolf_kill_target:
+        if self.wolf_kill_target is not None:
             kp = self.get_player_by_id(self.wolf_kill_target)
-            if kp and kp.is_alive():
-                killed_player = {"id": kp.id, "name": kp.name, "status": "alive"}
+            if kp and kp.id in self._alive_ids:
+                killed_player = self._player_entries[kp.id]["status"]
         
         # Build poisoning targets
-        poison_targets = [{"id": p.id, "name": p.name, "status": "alive"} 
-                         for p in alive_players if p.id != player.id]
-        
-        # Include all players with their current status
-        all_players_info = []
-        for p in self.players:
-            all_players_info.append({
-                "id": p.id,
-                "name": p.name,
-                "status": "alive" if p.is_alive() else "dead",
-                "role": p.role.value
-            })
+        poison_targets = self._player_entries_for([p for p in alive_players if p.id != player.id], "status")
 
         return {
             "context_type": "witch_private",
             "round": self.current_round,
             "phase": self.phase,
             "killed_player": killed_player,
-            "heal_potion": player.witch_potions["heal"],
-            "poison_potion": player.witch_potions["poison"],
+            "heal_potion": player.heal_available,
+            "poison_potion": player.poison_available,
             "poison_targets": poison_targets,
-            "all_players": all_players_info,
-            "alive_players": [{"id": p.id, "name": p.name} for p in alive_players],
-            "dead_players": [{"id": p.id, "name": p.name} for p in dead_players],
+            "all_players": self._get_shared_entries("all", "full"),
+            "alive_players": self._get_shared_entries("alive", "brief"),
+            "dead_players": self._get_shared_entries("dead", "brief"),
             "instruction": "你必须做出选择：heal/poison/none"
         }
     
     def _get_day_context(self, player: Player) -> Dict[str, Any]:
         """Public day discussion context"""
-        alive_players = self.get_alive_players()
-        dead_players = self.get_dead_players()
-        
-        # Speaking order calculation
-        alive_sorted = sorted(alive_players, key=lambda p: p.id)
-        speaking_order = [p.id for p in alive_sorted]
-        player_index = speaking_order.index(player.id) if player.id in speaking_order else -1
+        # Speaking order calculation; alive entries are already kept in id order
+        alive_entries = self._get_shared_entries("alive", "status")
+        speaking_order = list(self._alive_order)
+        split = bisect_left(speaking_order, player.id)
+        is_speaking = split < len(speaking_order) and speaking_order[split] == player.id
+        player_index = split if is_speaking else -1
         
-        players_who_spoke = [p for p in alive_sorted if p.id < player.id]
-        players_remaining = [p for p in alive_sorted if p.id > player.id]
+        players_before_me = alive_entries[:split]
+        players_after_me = alive_entries[split + 1:] if is_speaking else alive_entries[split:]
         
         # Build public speech history with actual content (without revealing roles)
         speech_history = []
-        for p in players_who_spoke:
+        round_speeches = self._day_speech_index.get(self.current_round, {})
+        for entry in players_before_me:
             # Get actual speech from current round's day speeches
-            actual_speech = self._get_player_speech_in_round(p.id, self.current_round)
+            speech_record = round_speeches.get(entry["id"])
+            actual_speech = speech_record.get("speech") if speech_record else None
             speech_history.append({
-                "id": p.id,
-                "name": p.name,
-                "status": "alive" if p.is_alive() else "dead",
-                "speech": actual_speech if actual_speech else f"[玩家{p.name}尚未发言]"
+                **entry,
+                "speech": actual_speech if actual_speech else f"[玩家{entry['name']}尚未发言]"
             })
         
-        # Enhanced last words processing with validation and formatting
+        # Last words are validated once in add_last_words, so no need to re-check here
         last_words_info = []
-        if hasattr(self, 'last_words_context') and self.last_words_context:
-            # Only print debug info and last words once per round
-            if not self.last_words_printed.get(self.current_round, False):
-                print(f"🔍 DEBUG: 处理遗言信息 - 共 {len(self.last_words_context)} 条遗言")
-                self.last_words_printed[self.current_round] = True
-                
-                # Print each last word only once per round
-                for last_word in self.last_words_context:
-                    if self._validate_last_word_entry(last_word):
-                        print(f"😒遗言 - {last_word['name']}({last_word['player']}): {last_word['speech']}")
-            
-            # Always process last words for context (but don't print again)
+        if self.last_words_context:
+            self.logger.debug("处理遗言信息 - 共 %d 条遗言", len(self.last_words_context))
             for last_word in self.last_words_context:
-                if self._validate_last_word_entry(last_word):
-                    formatted_last_word = {
-                        "player": last_word["player"],
-                        "name": last_word["name"],
-                        "speech": last_word["speech"],
-                        "round": getattr(last_word, 'round', self.current_round),
-                        "death_reason": last_word.get("death_reason", "夜晚死亡"),
-                        "is_last_words": True
-                    }
-                    last_words_info.append(formatted_last_word)
+                formatted_last_word = {
+                    "player": last_word["player"],
+                    "name": last_word["name"],
+                    "speech": last_word["speech"],
+                    "round": getattr(last_word, 'round', self.current_round),
+                    "death_reason": last_word.get("death_reason", "夜晚死亡"),
+                    "is_last_words": True
+                }
+                last_words_info.append(formatted_last_word)
         else:
-            # Only print this debug message once per round
-            if not self.last_words_printed.get(self.current_round, False):
-                print(f"🔍 DEBUG: 无遗言信息可用")
-                self.last_words_printed[self.current_round] = True
-        
-        # Include all players with their current status
-        all_players_info = []
-        for p in self.players:
-            all_players_info.append({
-                "id": p.id,
-                "name": p.name,
-                "status": "alive" if p.is_alive() else "dead",
-                "role_display": "未知"  # 白天阶段不暴露角色
-            })
+            self.logger.debug("无遗言信息可用")
 
         # Add clear round and phase information to prevent hallucinations
         game_stage_info = {
@@ -412,88 +560,88 @@ class GameState:
             "previous_voting_results": self.current_round > 1
         }
         
+        # Player-independent parts are shared by every speaker in the same day
+        shared = self._get_day_shared_context()
+        
         # Add reality constraints information
         reality_constraints = {
             "current_round": self.current_round,
             "is_first_round": self.current_round == 1,
-            "available_information": self._get_available_information(),
+            "available_information": shared["available_information"],
             "forbidden_claims": self._get_forbidden_claims(player),
-            "required_disclaimers": self._get_required_disclaimers()
+            "required_disclaimers": shared["required_disclaimers"]
         }
         
         # 添加历史信息
-        historical_context = self._build_historical_context()
+        historical_context = shared["historical_context"]
         
-        return {
+        context = {
             "context_type": "day_public",
             "round": self.current_round,
             "phase": self.phase,
             "game_stage": game_stage_info,
             "available_information": available_info,
-            "alive_players": [{"id": p.id, "name": p.name, "status": "alive"} for p in alive_players],
-            "dead_players": [{"id": p.id, "name": p.name, "status": "dead"} for p in dead_players],
-            "all_players": all_players_info,
+            "alive_players": alive_entries,
+            "dead_players": self._get_shared_entries("dead", "status"),
+            "all_players": self._get_shared_entries("all", "public"),
             "speaking_order": speaking_order,
             "my_position": player_index + 1,
             "speech_history": speech_history,
             "last_words": last_words_info,
-            "players_before_me": [
-                {"id": p.id, "name": p.name, "status": "alive" if p.is_alive() else "dead"} 
-                for p in players_who_spoke
-            ],
-            "players_after_me": [
-                {"id": p.id, "name": p.name, "status": "alive" if p.is_alive() else "dead"}
-                for p in players_remaining
-            ],
+            "players_before_me": players_before_me,
+            "players_after_me": players_after_me,
             "historical_context": historical_context,  # 添加历史上下文
             "reality_constraints": reality_constraints,  # 添加现实约束信息
-            "context_instructions": {
-                "reminder": "这是真实的游戏信息，请基于实际发生的事件进行推理",
-                "first_round_note": f"这是第一轮游戏，{'但有死亡玩家的遗言信息需要重点关注' if len(last_words_info) > 0 else '没有前夜的查验结果或互动'}" if self.current_round == 1 else None,
-                "speech_note": "发言历史包含实际发言内容，如显示'尚未发言'则该玩家确实未发言",
-                "last_words_emphasis": f"死亡玩家的遗言包含重要信息，请仔细分析" if len(last_words_info) > 0 else None,
-                "historical_note": "历史信息包含之前轮次的重要内容，请结合历史信息进行分析" if historical_context["has_history"] else None
-            }
+            "context_instructions": _CONTEXT_INSTRUCTIONS[
+                (self.current_round == 1, bool(last_words_info), historical_context["has_history"])
+            ]
         }
         
         # Apply first round filtering if needed
         if self.current_round == 1:
-            return self._filter_context_for_first_round(context)
+            context = self._filter_context_for_first_round(context)
         
         return context
     
+    def _get_day_shared_context(self) -> Dict[str, Any]:
+        """Get the historical context and constraint lists shared by all day contexts
+        
+        Rebuilt only when one of their inputs changes; treat as read-only.
+        """
+        key = (
+            self.current_round,
+            bool(self.last_words_context),
+            len(self.all_last_words),
+            len(self.voting_history),
+            self._snapshot_version,
+        )
+        cached_key, shared = self._day_shared_context
+        if cached_key != key:
+            shared = {
+                "historical_context": self._build_historical_context(),
+                "available_information": self._get_available_information(),
+                "required_disclaimers": self._get_required_disclaimers(),
+            }
+            self._day_shared_context = (key, shared)
+        return shared
+    
     def _validate_last_word_entry(self, last_word: Dict[str, Any]) -> bool:
         """Validate last word entry format and content"""
-        required_fields = ["player", "name", "speech"]
-        
-        # Check if all required fields are present
-        for field in required_fields:
-            if field not in last_word:
-                print(f"🔍 DEBUG: 遗言验证失败 - 缺少字段: {field}")
-                return False
-        
-        # Check if player ID is valid
-        if not isinstance(last_word["player"], int) or last_word["player"] <= 0:
-            print(f"🔍 DEBUG: 遗言验证失败 - 无效玩家ID: {last_word['player']}")
-            return False
-        
-        # Check if name is not empty
-        if not last_word["name"] or not isinstance(last_word["name"], str):
-            print(f"🔍 DEBUG: 遗言验证失败 - 无效玩家姓名: {last_word['name']}")
-            return False
-        
-        # Check if speech is not empty
-        if not last_word["speech"] or not isinstance(last_word["speech"], str):
-            print(f"🔍 DEBUG: 遗言验证失败 - 无效遗言内容: {last_word['speech']}")
-            return False
-        
-        return True
+        # A missing field reads as None and fails its type check
+        player_id = last_word.get("player")
+        name = last_word.get("name")
+        speech = last_word.get("speech")
+        return (
+            isinstance(player_id, int) and player_id > 0
+            and isinstance(name, str) and name != ""
+            and isinstance(speech, str) and speech != ""
+        )
     
     def add_last_words(self, player_id: int, speech: str, death_reason: str = "夜晚死亡") -> bool:
         """Add last words to the context for day discussion"""
         player = self.get_player_by_id(player_id)
         if not player:
-            print(f"🔍 DEBUG: 添加遗言失败 - 找不到玩家: {player_id}")
+            self.logger.debug("添加遗言失败 - 找不到玩家: %s", player_id)
             return False
         
         last_word_entry = {
@@ -507,22 +655,27 @@ class GameState:
         
         if self._validate_last_word_entry(last_word_entry):
             self.last_words_context.append(last_word_entry)
-            print(f"🔍 DEBUG: 成功添加遗言 - {player.name}({player_id}): {speech[:50]}...")
+            self.logger.debug("成功添加遗言 - %s(%s)", player.name, player_id)
             return True
         else:
-            print(f"🔍 DEBUG: 添加遗言失败 - 验证不通过")
+            self.logger.debug("添加遗言失败 - 验证不通过: %s", last_word_entry)
             return False
     
+    def set_last_words_context(self, last_words: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Replace the day's last words, keeping only entries that pass validation"""
+        accepted = []
+        for last_word in last_words:
+            if self._validate_last_word_entry(last_word):
+                accepted.append(last_word)
+            else:
+                self.logger.debug("丢弃遗言 - 验证不通过: %s", last_word)
+        self.last_words_context = accepted
+        return accepted
+    
     def _get_player_speech_in_round(self, player_id: int, round_num: int) -> Optional[str]:
         """Get player's speech in a specific round"""
-        if round_num not in self.day_speeches:
-            return None
-        
-        for speech_record in self.day_speeches[round_num]:
-            if speech_record.get("player") == player_id:
-                return speech_record.get("speech")
-        
-        return None
+        speech_record = self._day_speech_index.get(round_num, {}).get(player_id)
+        return speech_record.get("speech") if speech_record else None
     
     def record_day_speech(self, player_id: int, speech: str, speaking_order: int = 0) -> bool:
         """Record a player's speech during day discussion"""
@@ -560,50 +713,24 @@ class GameState:
         }
         
         self.day_speeches[self.current_round].append(speech_record)
+        self._day_speech_index.setdefault(self.current_round, {}).setdefault(player_id, speech_record)
+        self._historical_speeches[self.current_round].append({
+            "player_id": player_id,
+            "player_name": player.name,
+            "speech": speech[:100] + "..." if len(speech) > 100 else speech,  # 截断长发言
+            "speaking_order": speaking_order
+        })
         return True
     
     def get_enhanced_speech_history(self, current_player_id: int) -> Dict[str, Any]:
         """Get enhanced speech history using the SpeechHistoryTracker"""
         try:
-            # Get all speeches for current round
-            current_round_speeches = self.speech_history_tracker.get_round_speeches(self.current_round, "day_discussion")
-            
-            # Get available references for the current player
-            available_refs = self.speech_history_tracker.get_available_references(
-                self.current_round, 
-                "day_discussion", 
-                exclude_player_id=current_player_id
-            )
-            
-            # Get all speeches from previous rounds
-            all_speeches = self.speech_history_tracker.get_all_speeches(limit=50)
-            
             return {
-                "current_round_speeches": [
-                    {
-                        "player_id": speech.player_id,
-                        "player_name": speech.player_name,
-                        "content": speech.speech_content,
-                        "speaking_order": speech.speaking_order,
-                        "timestamp": speech.timestamp.isoformat()
-                    }
-                    for speech in current_round_speeches
-                ],
-                "available_references": [
-                    {
-                        "player_id": ref.player_id,
-                        "player_name": ref.player_name,
-                        "content": ref.speech_content[:100] + "..." if len(ref.speech_content) > 100 else ref.speech_content,
-                        "round": ref.round_number,
-                        "phase": ref.phase
-                    }
-                    for ref in available_refs
-                ],
-                "total_speeches": len(all_speeches),
-                "speech_count_by_player": {
-                    player.id: self.speech_history_tracker.get_speech_count(player.id)
-                    for player in self.players
-                }
+                "current_round_speeches": self.get_current_round_speeches_view(),
+                "available_references": self.get_available_references_view(current_player_id),
+                # Same cap as get_all_speeches(limit=50), without sorting records to count them
+                "total_speeches": min(self.speech_history_tracker.get_speech_count(), 50),
+                "speech_count_by_player": self.get_speech_counts()
             }
         except Exception as e:
             print(f"Error getting enhanced speech history: {e}")
@@ -614,6 +741,42 @@ class GameState:
                 "speech_count_by_player": {}
             }
     
+    def get_current_round_speeches_view(self) -> List[Dict[str, Any]]:
+        """Get this round's day discussion speeches"""
+        return [
+            {
+                "player_id": speech.player_id,
+                "player_name": speech.player_name,
+                "content": speech.speech_content,
+                "speaking_order": speech.speaking_order,
+                "timestamp": speech.timestamp.isoformat()
+            }
+            for speech in self.speech_history_tracker.get_round_speeches(self.current_round, "day_discussion")
+        ]
+    
+    def get_available_references_view(self, current_player_id: int) -> List[Dict[str, Any]]:
+        """Get the speeches a player may reference, truncated to 100 characters"""
+        available_refs = self.speech_history_tracker.get_available_references(
+            self.current_round, 
+            "day_discussion", 
+            exclude_player_id=current_player_id
+        )
+        return [
+            {
+                "player_id": ref.player_id,
+                "player_name": ref.player_name,
+                "content": ref.speech_content[:100] + "..." if len(ref.speech_content) > 100 else ref.speech_content,
+                "round": ref.round_number,
+                "phase": ref.phase
+            }
+            for ref in available_refs
+        ]
+    
+    def get_speech_counts(self) -> Dict[int, int]:
+        """Get the number of recorded speeches per player"""
+        counts = self.speech_history_tracker.get_speech_counts()
+        return {player.id: counts.get(player.id, 0) for player in self.players}
+    
     def verify_player_speech_reference(self, claimed_speech: str, claimed_speaker_id: int) -> Dict[str, Any]:
         """Verify if a speech reference is valid using enhanced tracker"""
         try:
@@ -631,7 +794,7 @@ class GameState:
                 "verification_details": {
                     "claimed_speech": claimed_speech,
                     "claimed_speaker_id": claimed_speaker_id,
-                    "speaker_name": self.get_player_by_id(claimed_speaker_id).name if self.get_player_by_id(claimed_speaker_id) else "Unknown"
+                    "speaker_name": self._id_to_name.get(claimed_speaker_id, "Unknown")
                 }
             }
         except Exception as e:
@@ -654,7 +817,7 @@ class GameState:
                 "is_valid": is_valid,
                 "claimed_identity": claimed_identity,
                 "speaker_id": claimed_speaker_id,
-                "speaker_name": self.get_player_by_id(claimed_speaker_id).name if self.get_player_by_id(claimed_speaker_id) else "Unknown",
+                "speaker_name": self._id_to_name.get(claimed_speaker_id, "Unknown"),
                 "all_identity_claims": all_claims,
                 "has_made_identity_claims": len(all_claims) > 0
             }
@@ -677,8 +840,9 @@ class GameState:
             }
             
             # Get statistics for each player
+            speech_counts = self.speech_history_tracker.get_speech_counts()
             for player in self.players:
-                player_speech_count = self.speech_history_tracker.get_speech_count(player.id)
+                player_speech_count = speech_counts.get(player.id, 0)
                 player_identity_claims = self.speech_history_tracker.get_player_identity_claims(player.id)
                 
                 stats["speeches_by_player"][player.id] = {
@@ -694,12 +858,13 @@ class GameState:
                     }
             
             # Get statistics by round
+            round_counts = self.speech_history_tracker.get_round_speech_counts()
             for round_num in range(1, self.current_round + 1):
-                round_speeches = self.speech_history_tracker.get_round_speeches(round_num)
-                stats["speeches_by_round"][round_num] = len(round_speeches)
+                stats["speeches_by_round"][round_num] = round_counts.get(round_num, 0)
             
             return stats
-        except Exception as e:
+        except SpeechHistoryError as e:
+            # Only the identity-claim scan can fail; counts are plain index reads
             print(f"Error getting speech statistics: {e}")
             return {
                 "total_speeches": 0,
@@ -711,20 +876,18 @@ class GameState:
     
     def _build_historical_context(self) -> Dict[str, Any]:
         """构建历史上下文信息"""
+        # 如果是第一轮，没有历史信息
+        if self.current_round <= 1:
+            return _EMPTY_HISTORICAL_CONTEXT
+        
         historical_context = {
-            "has_history": False,
+            "has_history": True,
             "previous_rounds": [],
             "all_last_words": [],
             "voting_history": [],
             "eliminated_players": []
         }
         
-        # 如果是第一轮，没有历史信息
-        if self.current_round <= 1:
-            return historical_context
-        
-        historical_context["has_history"] = True
-        
         # 添加所有历史遗言
         if self.all_last_words:
             historical_context["all_last_words"] = [
@@ -739,111 +902,63 @@ class GameState:
             ]
         
         # 添加历史发言记录
-        previous_rounds_data = []
-        for round_num in range(1, self.current_round):
-            if round_num in self.day_speeches:
-                round_speeches = self.day_speeches[round_num]
-                previous_rounds_data.append({
-                    "round": round_num,
-                    "speeches": [
-                        {
-                            "player_id": speech["player"],
-                            "player_name": speech["name"],
-                            "speech": speech["speech"][:100] + "..." if len(speech["speech"]) > 100 else speech["speech"],  # 截断长发言
-                            "speaking_order": speech.get("speaking_order", 0)
-                        }
-                        for speech in round_speeches
-                    ]
-                })
-        
-        historical_context["previous_rounds"] = previous_rounds_data
+        historical_context["previous_rounds"] = list(self._iter_previous_rounds())
         
         # 添加投票历史
         if self.voting_history:
             historical_context["voting_history"] = self.voting_history
         
         # 添加已淘汰玩家信息
-        dead_players = self.get_dead_players()
-        if dead_players:
-            historical_context["eliminated_players"] = [
-                {
-                    "player_id": p.id,
-                    "player_name": p.name,
-                    "role": p.role.value,
-                    "elimination_round": getattr(p, 'elimination_round', 'unknown')
-                }
-                for p in dead_players
-            ]
+        if self._dead:
+            historical_context["eliminated_players"] = [self._eliminated_entries[p.id] for p in self._dead]
         
         return historical_context
     
+    def _iter_previous_rounds(self) -> Iterator[Dict[str, Any]]:
+        """Yield the speech summary of each completed round that had day speeches
+        
+        Completed rounds get no new speeches, so each summary is built once and shared.
+        """
+        for round_num in range(1, self.current_round):
+            if round_num in self.day_speeches:
+                summary = self._round_summaries.get(round_num)
+                if summary is None:
+                    summary = self._round_summaries[round_num] = {
+                        "round": round_num,
+                        "speeches": list(self._historical_speeches[round_num])
+                    }
+                yield summary
+    
     def record_voting_result(self, round_num: int, eliminated_player: Optional[int], vote_count: Dict[int, int]):
         """记录投票结果到历史"""
         voting_record = {
             "round": round_num,
             "eliminated_player": eliminated_player,
             "vote_count": vote_count,
-            "timestamp": datetime.now()
+            "timestamp_ns": time.monotonic_ns()
         }
         
         if eliminated_player:
             eliminated_player_obj = self.get_player_by_id(eliminated_player)
             if eliminated_player_obj:
                 voting_record["eliminated_name"] = eliminated_player_obj.name
-                voting_record["eliminated_role"] = eliminated_player_obj.role.value
+                voting_record["eliminated_role"] = self._role_values[eliminated_player]
         
         self.voting_history.append(voting_record)
     
     def _get_available_information(self) -> List[str]:
         """获取当前轮次可用的信息类型"""
-        available = ["玩家列表和编号", "夜晚死亡公告"]
-        
-        if hasattr(self, 'last_words_context') and self.last_words_context:
-            available.append("死亡玩家遗言")
-        
-        if self.current_round > 1:
-            available.extend([
-                "历史发言记录",
-                "历史投票结果",
-                "已淘汰玩家信息"
-            ])
-        
-        return available
+        return list(_AVAILABLE_INFORMATION[(self.current_round > 1, bool(self.last_words_context))])
     
     def _get_forbidden_claims(self, player: Player) -> List[str]:
         """获取该玩家禁止声称的身份"""
-        forbidden = []
-        
-        if player.role == Role.VILLAGER:
-            forbidden = ["预言家", "女巫", "猎人", "狼人"]
-        elif player.role == Role.WEREWOLF:
-            # 狼人可以假跳，但需要策略理由
-            forbidden = []  # 允许策略性假跳
-        elif player.role == Role.SEER:
-            forbidden = ["女巫", "猎人", "狼人"]
-        elif player.role == Role.WITCH:
-            forbidden = ["预言家", "猎人", "狼人"]
-        elif player.role == Role.HUNTER:
-            forbidden = ["预言家", "女巫", "狼人"]
-        
-        return forbidden
+        return list(_FORBIDDEN_CLAIMS.get(player.role, ()))
     
     def _get_required_disclaimers(self) -> List[str]:
         """获取必要的免责声明和约束提醒"""
-        disclaimers = [
-            "只能基于真实发生的游戏事件进行推理",
-            "不能编造不存在的玩家互动或发言内容",
-            "身份声明必须符合游戏规则和策略需要"
-        ]
-        
         if self.current_round == 1:
-            disclaimers.extend([
-                "第一轮游戏没有前夜信息可供分析",
-                "不能引用不存在的历史互动或查验结果",
-                "应该基于基础游戏规则进行推理"
-            ])
-        
-        return disclaimers
+            return list(_BASE_DISCLAIMERS + _FIRST_ROUND_DISCLAIMERS)
+        return list(_BASE_DISCLAIMERS)
     
     def _filter_context_for_first_round(self, context: Dict[str, Any]) -> Dict[str, Any]:
         """为第一轮游戏过滤上下文信息"""
@@ -851,29 +966,8 @@ class GameState:
             return context
         
         # 为第一轮添加特殊约束
-        first_round_constraints = {
-            "no_previous_night_info": True,
-            "no_interaction_history": True,
-            "focus_on_basic_logic": True,
-            "available_info_only": [
-                "夜晚死亡公告",
-                "死亡玩家遗言（如果有）",
-                "玩家列表和编号"
-            ],
-            "forbidden_references": [
-                "前夜查验结果",
-                "复杂互动分析",
-                "历史行为模式",
-                "投票历史"
-            ]
-        }
-        
-        context["first_round_constraints"] = first_round_constraints
-        context["guidance"] = {
-            "analysis_focus": "遗言信息和基础游戏规则",
-            "avoid_topics": ["前夜查验", "复杂互动", "历史行为"],
-            "recommended_approach": "谨慎分析，基于事实发言"
-        }
+        context["first_round_constraints"] = _FIRST_ROUND_CONSTRAINTS
+        context["guidance"] = _FIRST_ROUND_GUIDANCE
         
         return context
     
@@ -883,7 +977,7 @@ class GameState:
             "player_info": {
                 "id": player.id,
                 "name": player.name,
-                "role": player.role.value,
-                "is_alive": player.is_alive()
+                "role": self._role_values[player.id],
+                "is_alive": player.id in self._alive_ids
             }
         }
\ No newline at end of file
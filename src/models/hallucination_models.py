@@ -10,7 +10,7 @@ from pydantic import BaseModel
 
 
 # Enumerations for hallucination detection
-class HallucinationType(Enum):
+class HallucinationType(str, Enum):
     """Types of hallucinations that can be detected."""
     FALSE_REFERENCE = "false_reference"
     IDENTITY_INCONSISTENCY = "identity_inconsistency"
@@ -19,7 +19,7 @@ class HallucinationType(Enum):
     INVALID_CLAIM = "invalid_claim"
 
 
-class HallucinationSeverity(Enum):
+class HallucinationSeverity(str, Enum):
     """Severity levels for detected hallucinations."""
     LOW = "low"
     MEDIUM = "medium"
@@ -31,6 +31,8 @@ class HallucinationSeverity(Enum):
 @dataclass
 class SpeechRecord:
     """Record of a player's speech in the game."""
+    __slots__ = ("player_id", "player_name", "speech_content", "round_number", "phase", "timestamp", "speaking_order")
+    
     player_id: int
     player_name: str
     speech_content: str
@@ -43,6 +45,8 @@ class SpeechRecord:
 @dataclass
 class ReferenceInfo:
     """Information about available references for speech validation."""
+    __slots__ = ("player_id", "player_name", "speech_content", "round_number", "phase", "is_available")
+    
     player_id: int
     player_name: str
     speech_content: str
@@ -55,6 +59,8 @@ class ReferenceInfo:
 @dataclass
 class TextLocation:
     """Location of text within a speech."""
+    __slots__ = ("start_index", "end_index", "text")
+    
     start_index: int
     end_index: int
     text: str
@@ -63,6 +69,8 @@ class TextLocation:
 @dataclass
 class Hallucination:
     """Represents a detected hallucination in player speech."""
+    __slots__ = ("type", "description", "location", "severity", "suggested_correction")
+    
     type: HallucinationType
     description: str
     location: TextLocation
@@ -73,6 +81,8 @@ class Hallucination:
 @dataclass
 class HallucinationResult:
     """Result of hallucination detection analysis."""
+    __slots__ = ("is_valid", "hallucination_count", "hallucinations", "confidence_score", "correction_needed")
+    
     is_valid: bool
     hallucination_count: int
     hallucinations: List[Hallucination]
@@ -84,6 +94,8 @@ class HallucinationResult:
 @dataclass
 class FalseReference:
     """Represents a false reference to another player's speech."""
+    __slots__ = ("claimed_speaker", "claimed_content", "actual_content", "location")
+    
     claimed_speaker: str
     claimed_content: str
     actual_content: Optional[str]
@@ -93,6 +105,8 @@ class FalseReference:
 @dataclass
 class IdentityIssue:
     """Represents an identity-related inconsistency."""
+    __slots__ = ("player_mentioned", "claimed_identity", "actual_identity", "location")
+    
     player_mentioned: str
     claimed_identity: str
     actual_identity: Optional[str]
@@ -102,6 +116,8 @@ class IdentityIssue:
 @dataclass
 class TemporalError:
     """Represents a temporal reference error."""
+    __slots__ = ("claimed_time_reference", "actual_time_context", "location")
+    
     claimed_time_reference: str
     actual_time_context: str
     location: TextLocation
@@ -110,6 +126,8 @@ class TemporalError:
 @dataclass
 class FabricatedInteraction:
     """Represents a fabricated interaction between players."""
+    __slots__ = ("involved_players", "claimed_interaction", "location")
+    
     involved_players: List[str]
     claimed_interaction: str
     location: TextLocation
@@ -119,6 +137,8 @@ class FabricatedInteraction:
 @dataclass
 class Correction:
     """Represents a correction applied to speech."""
+    __slots__ = ("type", "original_text", "corrected_text", "reason")
+    
     type: HallucinationType
     original_text: str
     corrected_text: str
@@ -128,6 +148,8 @@ class Correction:
 @dataclass
 class CorrectionResult:
     """Result of speech correction process."""
+    __slots__ = ("original_speech", "corrected_speech", "corrections_applied", "success", "quality_score")
+    
     original_speech: str
     corrected_speech: str
     corrections_applied: List[Correction]
@@ -139,6 +161,8 @@ class CorrectionResult:
 @dataclass
 class PlayerHallucinationStats:
     """Statistics for a player's hallucinations."""
+    __slots__ = ("player_id", "player_name", "total_speeches", "hallucination_count", "hallucination_rate", "hallucinations_by_type", "corrections_applied", "correction_success_rate")
+    
     player_id: int
     player_name: str
     total_speeches: int
@@ -152,6 +176,8 @@ class PlayerHallucinationStats:
 @dataclass
 class GameHallucinationStats:
     """Overall game hallucination statistics."""
+    __slots__ = ("game_id", "total_speeches", "total_hallucinations", "overall_hallucination_rate", "hallucinations_by_type", "corrections_applied", "correction_success_rate")
+    
     game_id: str
     total_speeches: int
     total_hallucinations: int
@@ -164,6 +190,8 @@ class GameHallucinationStats:
 @dataclass
 class HallucinationReport:
     """Comprehensive hallucination report for a game."""
+    __slots__ = ("game_id", "generation_time", "game_stats", "player_stats", "detailed_cases", "summary")
+    
     game_id: str
     generation_time: datetime
     game_stats: GameHallucinationStats
@@ -175,6 +203,8 @@ class HallucinationReport:
 @dataclass
 class PlayerHallucinationReport:
     """Detailed hallucination report for a specific player."""
+    __slots__ = ("player_id", "player_name", "generation_time", "stats", "detailed_cases", "improvement_suggestions")
+    
     player_id: int
     player_name: str
     generation_time: datetime
@@ -1,7 +1,11 @@
 import json
+import logging
 import requests
 import re
-from typing import Dict, List, Optional, Any
+import time
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Dict, List, Optional, Any, Tuple
 from pydantic import Field
 from .player import Player, Role, PlayerStatus
 from ..utils.hallucination_detector import MultiLayerHallucinationDetector
@@ -10,6 +14,113 @@ from ..utils.context_builder import EnhancedContextBuilder
 from .hallucination_models import HallucinationReductionConfig
 
 
+logger = logging.getLogger(__name__)
+
+# 所有玩家共享同一个 HTTP 会话，复用连接池，避免每次请求重新握手
+_http_session = requests.Session()
+# 限流（429，遵循 Retry-After）、网关偶发的 5xx 和建连失败在连接层按指数退避重试，
+# 聊天补全请求重发没有副作用；读超时不重试，避免在熔断器之下叠加多次长超时
+_http_adapter = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, connect=2, read=0, status=2, backoff_factor=0.5,
+                      status_forcelist=[429, 500, 502, 503, 504],
+                      allowed_methods=frozenset(["POST"]), raise_on_status=False)
+)
+_http_session.mount("https://", _http_adapter)
+_http_session.mount("http://", _http_adapter)
+
+
+class _CircuitBreaker:
+    """简单熔断器：连续失败达到阈值后，冷却期内直接失败，不再逐个等待超时"""
+    
+    def __init__(self, failure_threshold: int = 3, cooldown: float = 60.0):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.fail_count = 0
+        self.opened_until = 0.0
+    
+    def is_open(self) -> bool:
+        return time.monotonic() < self.opened_until
+    
+    def record_success(self):
+        self.fail_count = 0
+        self.opened_until = 0.0
+    
+    def record_failure(self):
+        self.fail_count += 1
+        if self.fail_count >= self.failure_threshold:
+            self.opened_until = time.monotonic() + self.cooldown
+
+
+# 每个 API 地址一个熔断器，使用同一地址的玩家共享
+_circuit_breakers: Dict[str, _CircuitBreaker] = {}
+
+# 建连超时 10 秒，读超时 180 秒（长发言生成较慢）
+_REQUEST_TIMEOUT = (10, 180)
+
+# 只有这些错误说明服务端不可用，计入熔断；400/401/404 等是请求本身的问题
+_TRANSPORT_ERRORS = (requests.Timeout, requests.ConnectionError, requests.exceptions.ChunkedEncodingError)
+
+
+class LLMRequestError(Exception):
+    """LLM 请求失败（网络错误、非 200 状态或熔断中），调用方应走默认逻辑"""
+    
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+# 每个玩家保留的最近对话记录条数
+_CONVERSATION_HISTORY_LIMIT = 64
+
+# 结构化行动（投票、击杀、查验、用药）只需要几行标签，限制生成长度
+_STRUCTURED_MAX_TOKENS = 512
+
+# 结构化回复中的标签行，如 "VOTE: 3"、"ACTION: heal"
+_TAG_RE = re.compile(r'^\s*(VOTE|KILL|CHECK|ACTION|TARGET|SPEECH):(.*)$', re.MULTILINE)
+_NUMBER_RE = re.compile(r'\d+')
+
+# 提示词片段模板，循环中直接 format 后统一 join
+_SPEECH_ENTRY_TEMPLATE = "\n\n【第{order}位发言】{name}(编号{player_id})：\n「{speech}」"
+_TARGET_LINE_TEMPLATE = "- {name}({pid})\n"
+
+_DAY_SPEECH_RULES = """
+
+=== 🔒 发言规则约束 ===
+⚠️ 严格规则：
+1. 只能分析已经发言的玩家
+2. 不能提及未发言玩家的观点或行为
+3. 使用'根据前面发言'、'从已发言玩家来看'等限定词
+4. 避免绝对判断，使用'可能'、'倾向于'等表述
+5. 不能编造任何玩家间的私下互动或对话"""
+
+_VOTING_RULES = """
+
+=== 🗳️ 投票阶段特殊规则 ===
+⚠️ 投票约束：
+1. 必须基于已知事实进行投票决策
+2. 如果有预言家查杀信息，这是最高优先级依据
+3. 不能投票给已证明身份的真预言家
+4. 投票理由必须基于具体的游戏信息"""
+
+
+def _name_map(context: Dict[str, Any]) -> Dict[int, str]:
+    """根据 context 中的玩家信息构建编号到姓名的映射（不修改 context）"""
+    players_data = context.get("game_state", {}).get("players", {})
+    if not isinstance(players_data, dict):
+        return {}
+    return {
+        pid: player_info.get("name", f"玩家{pid}")
+        for pid, player_info in players_data.items()
+        if isinstance(player_info, dict)
+    }
+
+
+def _parse_tags(response: str) -> Dict[str, str]:
+    """一次扫描提取回复中的标签，同一标签以最后一次出现为准（先写草稿再给结论时取结论）"""
+    return {tag: value.strip() for tag, value in _TAG_RE.findall(response)}
+
+
 # 身份约束规则系统
 IDENTITY_CONSTRAINTS = {
     Role.VILLAGER: {
@@ -104,6 +215,156 @@ SPEECH_TEMPLATES = {
 }
 
 
+# 系统提示词中与具体玩家无关的固定段落，模块加载时构建一次
+_REALITY_CONSTRAINTS = """
+=== 严格现实约束（违反将导致失败）===
+🚨 绝对禁止的行为：
+1. 编造任何不存在的玩家发言或互动
+2. 声称拥有你真实身份以外的能力
+3. 编造查验结果、用药记录或其他虚假信息
+4. 引用不存在的历史事件或轮次信息
+5. 混淆其他玩家的身份或发言内容
+
+✅ 必须遵守的原则：
+1. 只能基于明确提供的游戏信息进行推理
+2. 发言必须符合你的真实身份和能力
+3. 所有推理必须基于已发生的确切事件
+4. 不确定的信息必须明确标注为"不确定"或"推测"
+5. 严格区分事实和推测，不能将推测当作事实
+"""
+
+_SPEECH_FORMAT = """
+=== 发言格式要求 ===
+你的每次发言必须：
+1. 明确表明你的玩家编号和姓名
+2. 基于已知事实进行分析
+3. 清楚区分事实陈述和个人推测
+4. 避免使用绝对化的表述
+5. 保持逻辑清晰和前后一致
+"""
+
+# 角色指令，只包含固定规则；查验记录、药剂等会变化的状态放在用户消息中
+_ENHANCED_ROLE_INSTRUCTIONS = {
+    Role.VILLAGER: """
+=== 村民角色指令 ===
+🎯 你的能力：无特殊能力，只能通过逻辑推理
+🎯 你的目标：找出并投票淘汰所有狼人
+
+✅ 允许的行为：
+- 分析其他玩家的发言逻辑
+- 相信预言家的查验结果
+- 支持真正的神职玩家
+- 基于事实进行推理和投票
+
+❌ 严格禁止的行为：
+- 声称自己是预言家、女巫或猎人
+- 编造查验结果或特殊信息
+- 声称拥有任何特殊能力
+- 编造与其他玩家的私下互动
+
+🔍 发言重点：
+- 基于已知事实进行逻辑分析
+- 支持已证明身份的预言家
+- 质疑可疑玩家的发言矛盾
+""",
+    Role.SEER: """
+=== 预言家角色指令 ===
+🎯 你的能力：每晚可以查验一名玩家的身份
+🎯 你的目标：通过查验结果指导好人阵营
+
+✅ 允许的行为：
+- 公开或隐藏你的预言家身份
+- 报告真实的查验结果
+- 指导好人阵营的投票决策
+- 在遗言中公开所有查验结果
+
+❌ 严格禁止的行为：
+- 编造虚假的查验结果
+- 声称查验了实际未查验的玩家
+- 混淆查验结果的时间和对象
+
+🔍 发言策略：
+- 查到狼人时建议公开身份并报告查杀
+- 查到好人时可以选择性公开
+- 面对质疑时坚持查验结果的真实性
+- 死亡时必须在遗言中公开所有查验信息
+""",
+    Role.WITCH: """
+=== 女巫角色指令 ===
+🎯 你的能力：拥有解药和毒药各一瓶
+🎯 你的目标：保护好人，毒杀狼人
+
+✅ 允许的行为：
+- 夜晚使用解药救人或毒药杀人
+- 白天伪装成普通村民
+- 基于预言家查验结果决定用药
+- 在关键时刻公开身份
+
+❌ 严格禁止的行为：
+- 过早暴露女巫身份
+- 编造用药记录或救人信息
+- 声称拥有查验能力
+- 编造与死亡玩家的互动
+
+🔍 发言策略：
+- 白天完全表现为普通村民
+- 不要暴露对夜晚事件的特殊了解
+- 支持预言家但不要过于明显
+- 保持身份隐秘直到必要时刻
+""",
+    Role.HUNTER: """
+=== 猎人角色指令 ===
+🎯 你的能力：死亡时可以开枪带走一名玩家
+🎯 你的目标：威慑狼人，关键时刻开枪
+
+✅ 允许的行为：
+- 平时保持低调，隐藏猎人身份
+- 死亡时选择开枪目标
+- 白天表现为普通村民
+- 观察分析为开枪做准备
+
+❌ 严格禁止的行为：
+- 过早暴露猎人身份
+- 威胁其他玩家开枪
+- 编造开枪记录或能力
+- 声称拥有查验或用药能力
+
+🔍 发言策略：
+- 隐藏身份，避免成为狼人目标
+- 不要过于激进或引人注目
+- 威慑作用比实际开枪更重要
+- 开枪目标应选择最可疑的狼人
+""",
+    Role.WEREWOLF: """
+=== 狼人角色指令 ===
+🎯 你的能力：夜晚与狼队友商议击杀目标
+🎯 你的目标：消灭好人，隐藏身份
+
+✅ 允许的行为：
+- 白天伪装成好人
+- 适当时机假跳神职身份（需策略考虑）
+- 与狼队友配合但必要时切割
+- 质疑预言家的可信度
+
+❌ 严格禁止的行为：
+- 暴露自己的狼人身份
+- 过度为狼队友辩护
+- 编造查验结果（除非假跳预言家）
+- 暴露夜晚击杀的内部讨论
+
+🔍 伪装策略：
+- 表现出寻找狼人的积极态度
+- 可以质疑预言家但不要过于明显
+- 队友被查杀时评估是否弃车保帅
+- 投票时表现出好人的思维逻辑
+""",
+}
+
+# 按 (role, team) 缓存的系统提示词；内容在整局游戏中保持不变，
+# 以便服务端的提示词前缀缓存能够命中
+_SYSTEM_PROMPTS: Dict[Tuple[Any, Any], str] = {}
+
+
 class RealityConstraintValidator:
     """现实约束验证器，检测和修正LLM发言中的幻觉内容"""
     
@@ -373,10 +634,10 @@ class SpeechCorrector:
 
 
 class LLMPlayer(Player):
-    conversation_history: List[Dict[str, str]] = []
-    speech_quality_log: List[Dict[str, Any]] = []
-    hallucination_detection_log: List[Dict[str, Any]] = []
-    correction_history: List[Dict[str, Any]] = []
+    conversation_history: List[Dict[str, str]] = Field(default_factory=list)
+    speech_quality_log: List[Dict[str, Any]] = Field(default_factory=list)
+    hallucination_detection_log: List[Dict[str, Any]] = Field(default_factory=list)
+    correction_history: List[Dict[str, Any]] = Field(default_factory=list)
     hallucination_config: Optional[HallucinationReductionConfig] = Field(default=None)
     hallucination_detector: Optional[Any] = Field(default=None)
     speech_corrector: Optional[Any] = Field(default=None)
@@ -398,60 +659,132 @@ class LLMPlayer(Player):
         if self.context_builder is None:
             self.context_builder = EnhancedContextBuilder(self.hallucination_config)
         
-    def send_message(self, prompt: str, context: Dict[str, Any] = None) -> str:
-        """Send a message to the LLM and get response with hallucination detection"""
+    def send_message(self, prompt: str, context: Dict[str, Any] = None,
+                     max_tokens: int = 8192, stop_tags: Optional[Tuple[str, ...]] = None) -> str:
+        """Send a message to the LLM and get response with hallucination detection
+        
+        If stop_tags is given the response is streamed and the connection is
+        closed as soon as every tag has been received on a complete line.
+        Raises LLMRequestError when the request fails, so that an error
+        message is never mistaken for model output.
+        """
+        breaker = _circuit_breakers.get(self.api_url)
+        if breaker is None:
+            breaker = _circuit_breakers[self.api_url] = _CircuitBreaker()
+        if breaker.is_open():
+            raise LLMRequestError(f"API {self.api_url} temporarily unavailable, request skipped")
+        
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+        
+        # Prepare the full context for the LLM
+        system_prompt = self._build_system_prompt()
+        full_prompt = self._build_full_prompt(prompt, context)
+        
+        payload = {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": full_prompt}
+            ],
+            "temperature": 0.7,  # 降低温度以减少幻觉
+            "max_tokens": max_tokens,  # 适中的token限制
+            "top_p": 0.9,  # 更保守的top_p设置
+            "frequency_penalty": 0.1,  # 轻微减少重复
+            "presence_penalty": 0.1   # 轻微鼓励新颖表达
+        }
+        if stop_tags:
+            payload["stream"] = True
+        
+        response = None
         try:
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-            
-            # Prepare the full context for the LLM
-            system_prompt = self._build_system_prompt()
-            full_prompt = self._build_full_prompt(prompt, context)
-            
-            payload = {
-                "model": self.model,
-                "messages": [
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": full_prompt}
-                ],
-                "temperature": 0.7,  # 降低温度以减少幻觉
-                "max_tokens": 8192,  # 适中的token限制
-                "top_p": 0.9,  # 更保守的top_p设置
-                "frequency_penalty": 0.1,  # 轻微减少重复
-                "presence_penalty": 0.1   # 轻微鼓励新颖表达
-            }
-            
-            response = requests.post(
+            # 直接发送 UTF-8 编码的中文，避免 json= 把每个汉字转义成 \uXXXX
+            response = _http_session.post(
                 f"{self.api_url}",
                 headers=headers,
-                json=payload,
-                timeout=180
+                data=json.dumps(payload, ensure_ascii=False).encode("utf-8"),
+                timeout=_REQUEST_TIMEOUT,
+                stream=bool(stop_tags)
             )
             
-            if response.status_code == 200:
-                result = response.json()
+            if response.status_code != 200:
+                if response.status_code == 429 or response.status_code >= 500:
+                    breaker.record_failure()
+                raise LLMRequestError(f"API returned status {response.status_code}", response.status_code)
+            
+            if stop_tags:
+                llm_response = self._read_streamed_response(response, stop_tags)
+            else:
+                result = json.loads(response.content)
                 llm_response = result["choices"][0]["message"]["content"]
+            # 完整读取回复后才算成功，流在中途断开时只记一次失败
+            breaker.record_success()
+        except _TRANSPORT_ERRORS as e:
+            breaker.record_failure()
+            raise LLMRequestError(f"Error communicating with LLM: {e}") from e
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            # 返回内容格式不符合预期，属于请求结果问题而非服务不可用
+            raise LLMRequestError(f"Unexpected LLM response: {e}") from e
+        finally:
+            # stream=True 时未读取的响应体会占住连接池中的连接，任何路径都要释放
+            if response is not None:
+                response.close()
+        
+        # 应用幻觉检测和修正
+        corrected_response = self._apply_hallucination_correction(llm_response, context)
+        
+        # Log the conversation (context is not kept; it can be rebuilt from the game state)
+        self.conversation_history.append({
+            "prompt": prompt,
+            "original_response": llm_response,
+            "corrected_response": corrected_response,
+            "timestamp": time.time()
+        })
+        del self.conversation_history[:-_CONVERSATION_HISTORY_LIMIT]
+        
+        return corrected_response
+    
+    def _ask_llm(self, prompt: str, context: Dict[str, Any] = None, **kwargs) -> str:
+        """调用 send_message；请求失败时记录日志并返回空字符串，由调用方走默认逻辑"""
+        try:
+            return self.send_message(prompt, context, **kwargs)
+        except LLMRequestError as e:
+            logger.warning("LLM请求失败 - %s(%s): %s", self.name, self.id, e)
+            return ""
+    
+    def _read_streamed_response(self, response, stop_tags: Tuple[str, ...]) -> str:
+        """读取流式回复，所需标签都已完整输出后提前断开连接"""
+        chunks = []
+        try:
+            for raw_line in response.iter_lines():
+                line = raw_line.decode("utf-8")
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
                 
-                # 应用幻觉检测和修正
-                corrected_response = self._apply_hallucination_correction(llm_response, context)
-                
-                # Log the conversation
-                self.conversation_history.append({
-                    "prompt": prompt,
-                    "context": context,
-                    "original_response": llm_response,
-                    "corrected_response": corrected_response,
-                    "timestamp": "current"
-                })
-                
-                return corrected_response
-            else:
-                return f"Error: API returned status {response.status_code}"
+                # 用量统计、保活等数据块可能没有 choices，直接跳过
+                choices = json.loads(data).get("choices") or []
+                if not choices:
+                    continue
+                delta = (choices[0].get("delta") or {}).get("content")
+                if not delta:
+                    continue
+                chunks.append(delta)
                 
-        except Exception as e:
-            return f"Error communicating with LLM: {str(e)}"
+                # 只解析已经完整输出的行，避免把 "VOTE: 1" 当成 "VOTE: 12"
+                if "\n" in delta:
+                    text = "".join(chunks)
+                    tags = _parse_tags(text[:text.rfind("\n")])
+                    if all(tag in tags for tag in stop_tags):
+                        break
+        finally:
+            response.close()
+        
+        return "".join(chunks)
     
     def _apply_hallucination_correction(self, response: str, context: Dict[str, Any] = None) -> str:
         """应用幻觉检测和修正"""
@@ -488,193 +821,43 @@ class LLMPlayer(Player):
     
     def _build_system_prompt(self) -> str:
         """构建清晰的系统提示词，严格防止幻觉"""
-        
-        # 核心身份信息
-        identity_info = f"""=== 你的身份信息 ===
-玩家编号：{self.id}
-玩家姓名：{self.name}
+        key = (self.role, self.team)
+        system_prompt = _SYSTEM_PROMPTS.get(key)
+        if system_prompt is None:
+            # 核心身份信息
+            identity_info = f"""=== 你的身份信息 ===
 真实身份：{self.get_role_description()}
 所属阵营：{self.team.value if hasattr(self.team, 'value') else self.team}
-生存状态：{"存活" if self.is_alive() else "死亡"}
 
 === 游戏目标 ===
 {self._get_simple_objective()}
 """
-
-        # 严格的现实约束
-        reality_constraints = """
-=== 严格现实约束（违反将导致失败）===
-🚨 绝对禁止的行为：
-1. 编造任何不存在的玩家发言或互动
-2. 声称拥有你真实身份以外的能力
-3. 编造查验结果、用药记录或其他虚假信息
-4. 引用不存在的历史事件或轮次信息
-5. 混淆其他玩家的身份或发言内容
-
-✅ 必须遵守的原则：
-1. 只能基于明确提供的游戏信息进行推理
-2. 发言必须符合你的真实身份和能力
-3. 所有推理必须基于已发生的确切事件
-4. 不确定的信息必须明确标注为"不确定"或"推测"
-5. 严格区分事实和推测，不能将推测当作事实
-"""
-
-        # 角色特定指令
-        role_instructions = self._get_enhanced_role_instructions()
-        
-        # 发言格式要求
-        speech_format = """
-=== 发言格式要求 ===
-你的每次发言必须：
-1. 明确表明你的玩家编号和姓名
-2. 基于已知事实进行分析
-3. 清楚区分事实陈述和个人推测
-4. 避免使用绝对化的表述
-5. 保持逻辑清晰和前后一致
-"""
-        
-        return identity_info + reality_constraints + role_instructions + speech_format
+            
+            # 角色特定指令
+            role_instructions = _ENHANCED_ROLE_INSTRUCTIONS.get(self.role, "请按照你的角色进行游戏。")
+            
+            system_prompt = identity_info + _REALITY_CONSTRAINTS + role_instructions + _SPEECH_FORMAT
+            _SYSTEM_PROMPTS[key] = system_prompt
+        return system_prompt
     
-    def _get_enhanced_role_instructions(self) -> str:
-        """获取增强的角色特定指令，严格防止幻觉"""
-        if self.role == Role.VILLAGER:
-            return """
-=== 村民角色指令 ===
-🎯 你的能力：无特殊能力，只能通过逻辑推理
-🎯 你的目标：找出并投票淘汰所有狼人
-
-✅ 允许的行为：
-- 分析其他玩家的发言逻辑
-- 相信预言家的查验结果
-- 支持真正的神职玩家
-- 基于事实进行推理和投票
-
-❌ 严格禁止的行为：
-- 声称自己是预言家、女巫或猎人
-- 编造查验结果或特殊信息
-- 声称拥有任何特殊能力
-- 编造与其他玩家的私下互动
-
-🔍 发言重点：
-- 基于已知事实进行逻辑分析
-- 支持已证明身份的预言家
-- 质疑可疑玩家的发言矛盾
-"""
-
-        elif self.role == Role.SEER:
-            return f"""
-=== 预言家角色指令 ===
-🎯 你的能力：每晚可以查验一名玩家的身份
-🎯 你的目标：通过查验结果指导好人阵营
-
-📊 当前查验记录：{self.seer_checks}
-
-✅ 允许的行为：
-- 公开或隐藏你的预言家身份
-- 报告真实的查验结果
-- 指导好人阵营的投票决策
-- 在遗言中公开所有查验结果
-
-❌ 严格禁止的行为：
-- 编造虚假的查验结果
-- 声称查验了实际未查验的玩家
-- 混淆查验结果的时间和对象
-
-🔍 发言策略：
-- 查到狼人时建议公开身份并报告查杀
-- 查到好人时可以选择性公开
-- 面对质疑时坚持查验结果的真实性
-- 死亡时必须在遗言中公开所有查验信息
+    def _build_player_status_context(self) -> str:
+        """构建玩家当前状态（编号、存活、查验记录、药剂等会变化的信息）"""
+        status_context = f"""=== 你的当前状态 ===
+玩家编号：{self.id}
+玩家姓名：{self.name}
+生存状态：{"存活" if self.is_alive() else "死亡"}
 """
-
+        if self.role == Role.SEER:
+            status_context += f"📊 当前查验记录：{self.seer_checks}\n"
         elif self.role == Role.WITCH:
-            heal_status = "可用" if self.witch_potions.get("heal", False) else "已使用"
-            poison_status = "可用" if self.witch_potions.get("poison", False) else "已使用"
-            
-            return f"""
-=== 女巫角色指令 ===
-🎯 你的能力：拥有解药和毒药各一瓶
-🎯 你的目标：保护好人，毒杀狼人
-
-💊 当前药剂状态：
-- 解药：{heal_status}
-- 毒药：{poison_status}
-
-✅ 允许的行为：
-- 夜晚使用解药救人或毒药杀人
-- 白天伪装成普通村民
-- 基于预言家查验结果决定用药
-- 在关键时刻公开身份
-
-❌ 严格禁止的行为：
-- 过早暴露女巫身份
-- 编造用药记录或救人信息
-- 声称拥有查验能力
-- 编造与死亡玩家的互动
-
-🔍 发言策略：
-- 白天完全表现为普通村民
-- 不要暴露对夜晚事件的特殊了解
-- 支持预言家但不要过于明显
-- 保持身份隐秘直到必要时刻
-"""
-
+            heal_status = "可用" if self.heal_available else "已使用"
+            poison_status = "可用" if self.poison_available else "已使用"
+            status_context += f"💊 当前药剂状态：解药{heal_status}，毒药{poison_status}\n"
         elif self.role == Role.HUNTER:
             shoot_status = "可用" if self.hunter_can_shoot else "已失效"
-            
-            return f"""
-=== 猎人角色指令 ===
-🎯 你的能力：死亡时可以开枪带走一名玩家
-🎯 你的目标：威慑狼人，关键时刻开枪
-
-🔫 当前状态：开枪能力{shoot_status}
-
-✅ 允许的行为：
-- 平时保持低调，隐藏猎人身份
-- 死亡时选择开枪目标
-- 白天表现为普通村民
-- 观察分析为开枪做准备
-
-❌ 严格禁止的行为：
-- 过早暴露猎人身份
-- 威胁其他玩家开枪
-- 编造开枪记录或能力
-- 声称拥有查验或用药能力
-
-🔍 发言策略：
-- 隐藏身份，避免成为狼人目标
-- 不要过于激进或引人注目
-- 威慑作用比实际开枪更重要
-- 开枪目标应选择最可疑的狼人
-"""
-
-        elif self.role == Role.WEREWOLF:
-            return """
-=== 狼人角色指令 ===
-🎯 你的能力：夜晚与狼队友商议击杀目标
-🎯 你的目标：消灭好人，隐藏身份
-
-✅ 允许的行为：
-- 白天伪装成好人
-- 适当时机假跳神职身份（需策略考虑）
-- 与狼队友配合但必要时切割
-- 质疑预言家的可信度
-
-❌ 严格禁止的行为：
-- 暴露自己的狼人身份
-- 过度为狼队友辩护
-- 编造查验结果（除非假跳预言家）
-- 暴露夜晚击杀的内部讨论
-
-🔍 伪装策略：
-- 表现出寻找狼人的积极态度
-- 可以质疑预言家但不要过于明显
-- 队友被查杀时评估是否弃车保帅
-- 投票时表现出好人的思维逻辑
-"""
-
-        else:
-            return "请按照你的角色进行游戏。"
+            status_context += f"🔫 当前状态：开枪能力{shoot_status}\n"
+        
+        return status_context + "\n"
     
     def _get_simple_objective(self) -> str:
         """获取简化的游戏目标描述"""
@@ -714,8 +897,8 @@ class LLMPlayer(Player):
 - 面对质疑时要坚持查验结果的真实性"""
 
         elif self.role == Role.WITCH:
-            heal_status = "可用" if self.witch_potions.get("heal", False) else "已使用"
-            poison_status = "可用" if self.witch_potions.get("poison", False) else "已使用"
+            heal_status = "可用" if self.heal_available else "已使用"
+            poison_status = "可用" if self.poison_available else "已使用"
             
             return f"""角色能力：拥有解药和毒药各一瓶
 当前药剂状态：
@@ -771,25 +954,26 @@ class LLMPlayer(Player):
     
     def _build_full_prompt(self, prompt: str, context: Dict[str, Any] = None) -> str:
         """构建完整的提示词，包含清晰的上下文信息"""
-        full_prompt = prompt
+        # 会变化的玩家状态放在用户消息开头，保持系统提示词不变
+        parts = [self._build_player_status_context(), prompt]
         
         if context:
             # 添加游戏状态信息
-            full_prompt += self._build_game_state_context(context)
+            parts.append(self._build_game_state_context(context))
             
             # 添加发言顺序信息
-            full_prompt += self._build_speaking_order_context(context)
+            parts.append(self._build_speaking_order_context(context))
             
             # 添加历史发言记录
-            full_prompt += self._build_speech_history_context(context)
+            parts.append(self._build_speech_history_context(context))
             
             # 添加夜晚事件信息
-            full_prompt += self._build_night_events_context(context)
+            parts.append(self._build_night_events_context(context))
             
             # 添加特殊规则提醒
-            full_prompt += self._build_special_rules_context(context)
+            parts.append(self._build_special_rules_context(context))
         
-        return full_prompt
+        return "".join(parts)
     
     def _build_game_state_context(self, context: Dict[str, Any]) -> str:
         """构建游戏状态上下文"""
@@ -842,21 +1026,24 @@ class LLMPlayer(Player):
         if not context.get("all_day_speeches"):
             return ""
         
-        context_str = f"\n\n=== 📝 本轮发言记录（按发言顺序）==="
-        context_str += f"\n⚠️ 重要：以下是所有玩家的真实发言，请严格基于这些内容进行分析"
-        
-        for i, speech in enumerate(context["all_day_speeches"], 1):
-            player_name = speech.get("name", f"玩家{speech.get('player', '?')}")
-            player_id = speech.get("player", "?")
-            speech_content = speech.get("speech", "")
-            speaking_order = speech.get("speaking_order", i)
-            
-            context_str += f"\n\n【第{speaking_order}位发言】{player_name}(编号{player_id})："
-            context_str += f"\n「{speech_content}」"
-        
-        context_str += f"\n\n⚠️ 分析约束：只能基于以上真实发言进行推理，不能编造任何不存在的内容"
+        parts = ["\n\n=== 📝 本轮发言记录（按发言顺序）===",
+                 "\n⚠️ 重要：以下是所有玩家的真实发言，请严格基于这些内容进行分析"]
+        parts.extend(self._format_day_speeches(context["all_day_speeches"]))
+        parts.append("\n\n⚠️ 分析约束：只能基于以上真实发言进行推理，不能编造任何不存在的内容")
         
-        return context_str
+        return "".join(parts)
+    
+    def _format_day_speeches(self, speeches: List[Dict[str, Any]]) -> List[str]:
+        """按发言顺序格式化当天的发言记录"""
+        return [
+            _SPEECH_ENTRY_TEMPLATE.format(
+                order=speech.get("speaking_order", i),
+                name=speech.get("name", f"玩家{speech.get('player', '?')}"),
+                player_id=speech.get("player", "?"),
+                speech=speech.get("speech", "")
+            )
+            for i, speech in enumerate(speeches, 1)
+        ]
     
     def _build_night_events_context(self, context: Dict[str, Any]) -> str:
         """构建夜晚事件上下文"""
@@ -875,22 +1062,11 @@ class LLMPlayer(Player):
         
         # 白天阶段的发言规则
         if context.get("game_state", {}).get("phase") == "day":
-            context_str += f"\n\n=== 🔒 发言规则约束 ==="
-            context_str += f"\n⚠️ 严格规则："
-            context_str += f"\n1. 只能分析已经发言的玩家"
-            context_str += f"\n2. 不能提及未发言玩家的观点或行为"
-            context_str += f"\n3. 使用'根据前面发言'、'从已发言玩家来看'等限定词"
-            context_str += f"\n4. 避免绝对判断，使用'可能'、'倾向于'等表述"
-            context_str += f"\n5. 不能编造任何玩家间的私下互动或对话"
+            context_str += _DAY_SPEECH_RULES
         
         # 投票阶段的特殊规则
         if context.get("voting_phase"):
-            context_str += f"\n\n=== 🗳️ 投票阶段特殊规则 ==="
-            context_str += f"\n⚠️ 投票约束："
-            context_str += f"\n1. 必须基于已知事实进行投票决策"
-            context_str += f"\n2. 如果有预言家查杀信息，这是最高优先级依据"
-            context_str += f"\n3. 不能投票给已证明身份的真预言家"
-            context_str += f"\n4. 投票理由必须基于具体的游戏信息"
+            context_str += _VOTING_RULES
         
         return context_str
     
@@ -907,29 +1083,22 @@ class LLMPlayer(Player):
         # 构建清晰的发言记录上下文
         day_speeches_context = ""
         if context and context.get("all_day_speeches"):
-            day_speeches_context = "\n\n=== 📝 今日完整发言记录（按发言顺序）==="
-            day_speeches_context += "\n⚠️ 重要：以下是所有玩家的真实发言，请严格基于这些内容进行分析"
-            
-            for i, speech in enumerate(context["all_day_speeches"], 1):
-                player_name = speech.get("name", f"玩家{speech.get('player', '?')}")
-                player_id = speech.get("player", "?")
-                speech_content = speech.get("speech", "")
-                speaking_order = speech.get("speaking_order", i)
-                
-                day_speeches_context += f"\n\n【第{speaking_order}位发言】{player_name}(编号{player_id})："
-                day_speeches_context += f"\n「{speech_content}」"
-            
-            day_speeches_context += "\n\n⚠️ 分析提醒：只能基于以上真实发言进行推理，不能编造任何不存在的内容"
+            parts = ["\n\n=== 📝 今日完整发言记录（按发言顺序）===",
+                     "\n⚠️ 重要：以下是所有玩家的真实发言，请严格基于这些内容进行分析"]
+            parts.extend(self._format_day_speeches(context["all_day_speeches"]))
+            parts.append("\n\n⚠️ 分析提醒：只能基于以上真实发言进行推理，不能编造任何不存在的内容")
+            day_speeches_context = "".join(parts)
         
         last_words_context = ""
         if context and context.get("last_words_for_voting"):
-            last_words_context = "\n\n🔥🔥🔥 关键遗言信息（投票决策的重要依据）🔥🔥🔥"
+            parts = ["\n\n🔥🔥🔥 关键遗言信息（投票决策的重要依据）🔥🔥🔥"]
             for lw in context["last_words_for_voting"]:
                 player_name = lw.get("name", f"玩家{lw.get('player', '?')}")
                 player_id = lw.get("player", "?")
                 speech = lw.get("speech", "")
-                last_words_context += f"\n📢 死亡玩家{player_name}({player_id})的完整遗言：\n   「{speech}」"
-            last_words_context += "\n\n⚠️ 投票提醒：如果遗言中有预言家查杀信息，这是最可靠的投票依据！"
+                parts.append(f"\n📢 死亡玩家{player_name}({player_id})的完整遗言：\n   「{speech}」")
+            parts.append("\n\n⚠️ 投票提醒：如果遗言中有预言家查杀信息，这是最可靠的投票依据！")
+            last_words_context = "".join(parts)
         
         # 强化预言家保护机制 - 基于游戏历史和查杀记录
         seer_protection_warning = ""
@@ -1016,6 +1185,12 @@ class LLMPlayer(Player):
                     safe_candidates = [c for c in safe_candidates if c != proven_seer]
                     break  # 只需要一个警告
 
+        # 只剩一个候选人时无需询问LLM
+        if len(safe_candidates) == 1:
+            print(f"✅ {self.name}({self.id}) 投票给玩家 {safe_candidates[0]}（唯一候选）")
+            logger.debug("跳过LLM投票 - %s(%s): 唯一候选 %s", self.name, self.id, safe_candidates[0])
+            return safe_candidates[0]
+
         prompt = f"""=== 投票阶段战略分析 ===
 
 {seer_protection_warning}
@@ -1048,20 +1223,13 @@ REASON: [详细的投票理由，必须基于具体的游戏信息和策略分
 VOTE: 3
 REASON: 预言家明确查杀了玩家3，且无其他玩家对跳预言家，这个查杀信息可信度极高。玩家3在发言中试图质疑预言家，这种行为符合被查杀狼人的典型反应。
 """
-        response = self.send_message(prompt)
+        response = self._ask_llm(prompt, max_tokens=_STRUCTURED_MAX_TOKENS, stop_tags=("VOTE",))
         # print(f"投票阶段 - {self.name}({self.id}) 的投票决策：{response}")  # 简化投票输出
         
         try:
             # Parse structured response
-            lines = response.strip().split('\n')
-            vote_target = None
-            
-            for line in lines:
-                line = line.strip()
-                if line.startswith('VOTE:'):
-                    target_str = line.split(':', 1)[1].strip()
-                    if target_str.isdigit():
-                        vote_target = int(target_str)
+            target_str = _parse_tags(response).get('VOTE', '')
+            vote_target = int(target_str) if target_str.isdigit() else None
             
             if vote_target and vote_target in safe_candidates:
                 print(f"✅ {self.name}({self.id}) 投票给玩家 {vote_target}")
@@ -1072,8 +1240,7 @@ REASON: 预言家明确查杀了玩家3，且无其他玩家对跳预言家，
         
         # Fallback to simple parsing
         try:
-            import re
-            numbers = re.findall(r'\d+', response)
+            numbers = _NUMBER_RE.findall(response)
             for num in numbers:
                 if int(num) in safe_candidates:
                     print(f"✅ {self.name}({self.id}) 投票给玩家 {num}（回退解析）")
@@ -1180,22 +1347,11 @@ REASON: 预言家明确查杀了玩家3，且无其他玩家对跳预言家，
             # print("🔍 DEBUG: No non-wolf players available")
             return {}
         
-        # Get player names for display
-        player_names = {}
-        players_data = context.get("game_state", {}).get("players", {})
-        
-        if isinstance(players_data, dict):
-            # New format: players is dict with ID keys
-            for pid in non_wolf_players:
-                player_info = players_data.get(pid, {})
-                if isinstance(player_info, dict):
-                    player_names[pid] = player_info.get("name", f"玩家{pid}")
-                else:
-                    player_names[pid] = f"玩家{pid}"
-        else:
-            # Fallback for any other format
-            for pid in non_wolf_players:
-                player_names[pid] = f"玩家{pid}"
+        # 只剩一个可选目标时无需询问LLM
+        if len(non_wolf_players) == 1:
+            print(f"🐺 狼人 {self.name}({self.id}) 只有一个可选目标，直接击杀玩家 {non_wolf_players[0]}")
+            logger.debug("跳过LLM击杀决策 - %s(%s): 唯一目标 %s", self.name, self.id, non_wolf_players[0])
+            return {"action": "kill", "target": non_wolf_players[0], "wolf_id": self.id}
         
         # Wolf team context - all wolves see the same info
         # Get target names from context
@@ -1210,9 +1366,10 @@ REASON: 预言家明确查杀了玩家3，且无其他玩家对跳预言家，
 
 可选击杀目标（都是好人身份）：
 """
-        for pid in non_wolf_players:
-            name = target_names.get(pid, f"玩家{pid}")
-            prompt += f"- {name}({pid})\n"
+        prompt += "".join(
+            _TARGET_LINE_TEMPLATE.format(name=target_names.get(pid, f"玩家{pid}"), pid=pid)
+            for pid in non_wolf_players
+        )
         
         prompt += f"""
 作为狼人团队，你们需要统一选择一个目标进行击杀。请你基于玩家的发言，确认最优先的击杀目标。
@@ -1227,21 +1384,17 @@ REASON: 该玩家白天表现可疑，可能是神职，优先击杀
 
 狼人团队必须达成一致击杀目标。"""
         
-        response = self.send_message(prompt, context)
+        response = self._ask_llm(prompt, context, max_tokens=_STRUCTURED_MAX_TOKENS, stop_tags=("KILL",))
         # print(f"🐺 狼人 {self.name}({self.id}) 的击杀选择：{response}")
         
         # Strict parsing
         try:
-            lines = response.strip().split('\n')
-            for line in lines:
-                line = line.strip()
-                if line.startswith('KILL:'):
-                    target_str = line.split(':', 1)[1].strip()
-                    if target_str.isdigit():
-                        target = int(target_str)
-                        if target in non_wolf_players:
-                            # print(f"✅ 狼人 {self.name}({self.id}) 选择击杀玩家 {target}")
-                            return {"action": "kill", "target": target, "wolf_id": self.id}
+            target_str = _parse_tags(response).get('KILL', '')
+            if target_str.isdigit():
+                target = int(target_str)
+                if target in non_wolf_players:
+                    # print(f"✅ 狼人 {self.name}({self.id}) 选择击杀玩家 {target}")
+                    return {"action": "kill", "target": target, "wolf_id": self.id}
         except Exception as e:
             # print(f"解析狼人选择失败：{e}")
             pass
@@ -1251,11 +1404,6 @@ REASON: 该玩家白天表现可疑，可能是神职，优先击杀
         # print(f"⚠️ 狼人 {self.name}({self.id}) 强制选择击杀玩家 {target}")
         return {"action": "kill", "target": target, "wolf_id": self.id}
     
-    def _hunter_action(self, context: Dict[str, Any]) -> Dict[str, Any]:
-        """Hunter action - decide whether to shoot when killed"""
-        # Hunter doesn't have night actions, only day actions when killed
-        return {}
-    
     def _seer_action(self, context: Dict[str, Any]) -> Dict[str, Any]:
         """Seer night action - check a player's identity with strict format"""
         # Handle both old and new context formats
@@ -1281,28 +1429,23 @@ REASON: 该玩家白天表现可疑，可能是神职，优先击杀
                 return {"action": "none"}
             
             # Get player names
-            player_names = {}
-            game_state = context.get("game_state", {})
-            players_data = game_state.get("players", {})
-            
-            for pid in unchecked_players:
-                if isinstance(players_data, dict):
-                    player_data = players_data.get(pid, {})
-                    player_names[pid] = player_data.get("name", f"玩家{pid}")
-                else:
-                    player_names[pid] = f"玩家{pid}"
-            
+            player_names = _name_map(context)
             display_targets = [(pid, player_names.get(pid, f"玩家{pid}")) for pid in unchecked_players]
             checked_players = self.seer_checks
         
+        # 只剩一个未查验玩家时无需询问LLM
+        if len(display_targets) == 1:
+            print(f"🔮 预言家 {self.name}({self.id}) 只剩一个未查验玩家，直接查验玩家 {display_targets[0][0]}")
+            logger.debug("跳过LLM查验决策 - %s(%s): 唯一目标 %s", self.name, self.id, display_targets[0][0])
+            return {"action": "check", "target": display_targets[0][0]}
+        
         prompt = f"""🔮 预言家夜间行动 - 第{self.game_state.current_round if hasattr(self, 'game_state') else 1}轮
 
 你是预言家，必须选择一名玩家进行身份查验。你的目标是找出狼人并为好人阵营提供关键信息。
 
 可选查验目标：
 """
-        for pid, name in display_targets:
-            prompt += f"- {name}({pid})\n"
+        prompt += "".join(_TARGET_LINE_TEMPLATE.format(name=name, pid=pid) for pid, name in display_targets)
         
         prompt += f"""
 已查验记录：{list(checked_players.keys()) or '无'}
@@ -1322,21 +1465,17 @@ REASON: 该玩家白天发言逻辑矛盾，对狼人行为分析过于详细，
 
 你必须选择一个玩家进行查验，并给出明确的策略理由。"""
         
-        response = self.send_message(prompt, context)
+        response = self._ask_llm(prompt, context, max_tokens=_STRUCTURED_MAX_TOKENS, stop_tags=("CHECK",))
         # print(f"🔮 预言家 {self.name}({self.id}) 的查验决策：{response}")
         
         # Strict parsing - must return a valid target
         try:
-            lines = response.strip().split('\n')
-            for line in lines:
-                line = line.strip()
-                if line.startswith('CHECK:'):
-                    target_str = line.split(':', 1)[1].strip()
-                    if target_str.isdigit():
-                        target = int(target_str)
-                        if target in [t[0] for t in display_targets]:
-                            # print(f"✅ 预言家 {self.name}({self.id}) 选择查验玩家 {target}")
-                            return {"action": "check", "target": target}
+            target_str = _parse_tags(response).get('CHECK', '')
+            if target_str.isdigit():
+                target = int(target_str)
+                if target in [t[0] for t in display_targets]:
+                    # print(f"✅ 预言家 {self.name}({self.id}) 选择查验玩家 {target}")
+                    return {"action": "check", "target": target}
         except Exception as e:
             # print(f"解析预言家查验失败：{e}")
             pass
@@ -1346,73 +1485,6 @@ REASON: 该玩家白天发言逻辑矛盾，对狼人行为分析过于详细，
         # print(f"⚠️ 预言家 {self.name}({self.id}) 强制选择查验玩家 {target}")
         return {"action": "check", "target": target}
     
-    def _hunter_action(self, context: Dict[str, Any]) -> Dict[str, Any]:
-        """Hunter action - decide whether to shoot when killed"""
-        # Hunter doesn't have night actions, only day actions when killed
-        return {}
-        
-        prompt = f"""作为预言家，请选择今晚要查验的玩家。
-
-可选玩家：{unchecked_players}
-
-请严格按照以下格式回复：
-ACTION: check
-TARGET: [玩家ID]
-REASON: [选择该玩家的原因]
-
-示例回复：
-ACTION: check
-TARGET: 7
-REASON: 该玩家白天发言积极，需要确认身份
-"""
-        response = self.send_message(prompt, context)
-        print(f"预言家 {self.name}({self.id}) 的查验决策：{response}")
-        
-        try:
-            # Parse structured response
-            lines = response.strip().split('\n')
-            action = ""
-            target = None
-            
-            for line in lines:
-                line = line.strip()
-                if line.startswith('ACTION:'):
-                    action = line.split(':', 1)[1].strip().lower()
-                elif line.startswith('TARGET:'):
-                    target_str = line.split(':', 1)[1].strip()
-                    if target_str.isdigit():
-                        target = int(target_str)
-            
-            if action == "check" and target and target in unchecked_players:
-                return {"action": "check", "target": target}
-                
-        except Exception as e:
-            print(f"解析预言家决策失败：{e}")
-        
-        # Fallback to simple parsing
-        try:
-            import re
-            numbers = re.findall(r'\d+', response)
-            for num in numbers:
-                if int(num) in unchecked_players:
-                    print(f"预言家 {self.name}({self.id}) 选择查验玩家 {num}")
-                    return {"action": "check", "target": int(num)}
-        except:
-            pass
-        
-        # Default to first unchecked player
-        if unchecked_players:
-            target = unchecked_players[0]
-            print(f"预言家 {self.name}({self.id}) 默认选择查验玩家 {target}")
-            return {"action": "check", "target": target}
-        
-        return {}
-    
-    def _hunter_action(self, context: Dict[str, Any]) -> Dict[str, Any]:
-        """Hunter action - decide whether to shoot when killed"""
-        # Hunter doesn't have night actions, only day actions when killed
-        return {}
-    
     def _witch_action(self, context: Dict[str, Any]) -> Dict[str, Any]:
         """Witch night action - private potion decision"""
         
@@ -1446,23 +1518,20 @@ REASON: 该玩家白天发言积极，需要确认身份
             alive_players = context.get("alive_players", [])
             
             # Get player names
-            game_state = context.get("game_state", {})
-            players_data = game_state.get("players", {})
-            
-            for pid in alive_players:
-                if pid != self.id:
-                    if isinstance(players_data, dict):
-                        player_data = players_data.get(pid, {})
-                        player_names[pid] = player_data.get("name", f"玩家{pid}")
-                    else:
-                        player_names[pid] = f"玩家{pid}"
-            
+            player_names = _name_map(context)
             display_targets = [(pid, player_names.get(pid, f"玩家{pid}")) 
                               for pid in alive_players if pid != self.id]
             
             # Always use actual player object state for potions
-            has_heal = self.witch_potions.get("heal", False)
-            has_poison = self.witch_potions.get("poison", False)
+            has_heal = self.heal_available
+            has_poison = self.poison_available
+        
+        # 没有可用的药（或没有可救的人且毒药已用）时无需询问LLM
+        if not has_poison and not (has_heal and killed_player is not None):
+            print(f"✅ 女巫 {self.name}({self.id}) 没有可用的药物，本夜不行动")
+            logger.debug("跳过LLM用药决策 - %s(%s): 解药=%s 毒药=%s 被击杀玩家=%s",
+                         self.name, self.id, has_heal, has_poison, killed_player)
+            return {"action": "none"}
         
         prompt = f"""🧙‍♀️ 女巫的私人夜间决策 - 第{context.get('game_state', {}).get('round', 1)}轮
 
@@ -1476,8 +1545,7 @@ REASON: 该玩家白天发言积极，需要确认身份
             prompt += f"- 今晚被狼人击杀的玩家：{killed_name}({killed_player})\n"
         
         prompt += f"\n可选毒药目标：\n"
-        for pid, name in display_targets:
-            prompt += f"- {name}({pid})\n"
+        prompt += "".join(_TARGET_LINE_TEMPLATE.format(name=name, pid=pid) for pid, name in display_targets)
         
         prompt += f"""
 作为女巫，你必须做出以下选择之一：
@@ -1504,27 +1572,19 @@ TARGET:
 
 你必须做出选择，不能跳过。"""
         
-        response = self.send_message(prompt, context)
+        response = self._ask_llm(prompt, context, max_tokens=_STRUCTURED_MAX_TOKENS, stop_tags=("ACTION", "TARGET"))
         print(f"🧙‍♀️ 女巫 {self.name}({self.id}) 的私人决策：{response}".replace('\n', ''))
         
         # Strict parsing
         try:
-            lines = response.strip().split('\n')
-            action = ""
-            target = None
-            
-            for line in lines:
-                line = line.strip()
-                if line.startswith('ACTION:'):
-                    action = line.split(':', 1)[1].strip().lower()
-                elif line.startswith('TARGET:'):
-                    target_str = line.split(':', 1)[1].strip()
-                    if target_str.isdigit():
-                        target = int(target_str)
+            tags = _parse_tags(response)
+            action = tags.get('ACTION', '').lower()
+            target_str = tags.get('TARGET', '')
+            target = int(target_str) if target_str.isdigit() else None
             
             # Validate action with correct potion check
-            actual_has_heal = self.witch_potions.get("heal", False)
-            actual_has_poison = self.witch_potions.get("poison", False)
+            actual_has_heal = self.heal_available
+            actual_has_poison = self.poison_available
             
             # print(f"🔍 DEBUG: Witch potion check - heal: {actual_has_heal}, poison: {actual_has_poison}")
             
@@ -1592,53 +1652,55 @@ TARGET:
         last_words_info = ""
         last_words = context.get("last_words") or context.get("available_last_words", [])
         if last_words:
-            last_words_info = "\n\n🔥🔥🔥 重要遗言信息（必须仔细阅读，不要理解错误）🔥🔥🔥："
+            parts = ["\n\n🔥🔥🔥 重要遗言信息（必须仔细阅读，不要理解错误）🔥🔥🔥："]
             for lw in last_words:
                 player_name = lw.get("name") or lw.get("player_name", f"玩家{lw.get('player', lw.get('player_id', '?'))}")
                 player_id = lw.get("player") or lw.get("player_id", "?")
                 speech = lw.get("speech") or lw.get("last_words", "")
-                last_words_info += f"\n📢 死亡玩家{player_name}({player_id})的完整遗言内容：\n   「{speech}」"
-            last_words_info += "\n\n⚠️⚠️⚠️ 重要提醒：请仔细阅读遗言的具体内容，不要误解或编造遗言中没有的信息！⚠️⚠️⚠️"
-            last_words_info += "\n💡 如果遗言中提到查杀某个玩家，请准确记住是哪个玩家被查杀！"
-            last_words_info += "\n🚫 绝对不要说遗言中查杀了你自己，除非遗言明确提到你的编号！"
+                parts.append(f"\n📢 死亡玩家{player_name}({player_id})的完整遗言内容：\n   「{speech}」")
+            parts.append("\n\n⚠️⚠️⚠️ 重要提醒：请仔细阅读遗言的具体内容，不要误解或编造遗言中没有的信息！⚠️⚠️⚠️")
+            parts.append("\n💡 如果遗言中提到查杀某个玩家，请准确记住是哪个玩家被查杀！")
+            parts.append("\n🚫 绝对不要说遗言中查杀了你自己，除非遗言明确提到你的编号！")
+            last_words_info = "".join(parts)
         
         # Add historical context information if available
         historical_info = ""
         historical_context = context.get("historical_context", {})
         if historical_context.get("has_history"):
-            historical_info = "\n\n📚 历史游戏信息（重要参考）："
+            parts = ["\n\n📚 历史游戏信息（重要参考）："]
             
             # 添加历史遗言
             if historical_context.get("all_last_words"):
-                historical_info += "\n\n🗣️ 历史遗言记录："
+                parts.append("\n\n🗣️ 历史遗言记录：")
                 for hw in historical_context["all_last_words"]:
                     round_num = hw.get("round", "?")
                     player_name = hw.get("player_name", "?")
                     player_id = hw.get("player_id", "?")
                     last_words = hw.get("last_words", "")
-                    historical_info += f"\n  第{round_num}轮 - {player_name}({player_id}): {last_words}"
+                    parts.append(f"\n  第{round_num}轮 - {player_name}({player_id}): {last_words}")
             
             # 添加历史发言记录
             if historical_context.get("previous_rounds"):
-                historical_info += "\n\n💬 历史发言记录："
+                parts.append("\n\n💬 历史发言记录：")
                 for round_data in historical_context["previous_rounds"]:
                     round_num = round_data.get("round", "?")
                     speeches = round_data.get("speeches", [])
-                    historical_info += f"\n  第{round_num}轮发言 ({len(speeches)}条):"
+                    parts.append(f"\n  第{round_num}轮发言 ({len(speeches)}条):")
                     for speech in speeches:  # 只显示前3条发言
                         player_name = speech.get("player_name", "?")
                         content = speech.get("speech", "")
-                        historical_info += f"\n    - {player_name}: {content}"
+                        parts.append(f"\n    - {player_name}: {content}")
             
             # 添加投票历史
             if historical_context.get("voting_history"):
-                historical_info += "\n\n🗳️ 历史投票记录："
+                parts.append("\n\n🗳️ 历史投票记录：")
                 for vote_record in historical_context["voting_history"]:
                     round_num = vote_record.get("round", "?")
                     eliminated_name = vote_record.get("eliminated_name", "无人")
-                    historical_info += f"\n  第{round_num}轮: {eliminated_name}被淘汰"
+                    parts.append(f"\n  第{round_num}轮: {eliminated_name}被淘汰")
             
-            historical_info += "\n\n💡 请结合历史信息和当前情况进行综合分析！"
+            parts.append("\n\n💡 请结合历史信息和当前情况进行综合分析！")
+            historical_info = "".join(parts)
         
         # Role-specific speech constraints
         role_constraints = """
@@ -1732,17 +1794,17 @@ SPEECH: 我是第{my_position}个发言，我是{self.name}，我的编号是{se
 
 请开始你的发言："""
         
-        response = self.send_message(prompt, context)
+        try:
+            response = self.send_message(prompt, context)
+        except LLMRequestError as e:
+            # 请求失败时给出不含任何信息的过渡发言，不能把错误信息当成发言
+            logger.warning("LLM请求失败 - %s(%s): %s", self.name, self.id, e)
+            return f"我是{self.name}，编号{self.id}。我暂时没有更多信息，先听听其他玩家的发言。"
         
         # Extract only the SPEECH content
         initial_speech = ""
         try:
-            lines = response.strip().split('\n')
-            for line in lines:
-                line = line.strip()
-                if line.startswith('SPEECH:'):
-                    initial_speech = line.split(':', 1)[1].strip()
-                    break
+            initial_speech = _parse_tags(response).get('SPEECH', '')
             
             # If no SPEECH tag found, use the full response
             if not initial_speech:
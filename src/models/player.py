@@ -1,5 +1,6 @@
 from enum import Enum
-from typing import Dict, Any, Optional
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional
 from pydantic import BaseModel, Field
 
 
@@ -32,8 +33,9 @@ class Player(BaseModel):
     model: str = "gpt-3.5-turbo"
     
     # Role-specific state
-    seer_checks: Dict[int, str] = {}  # player_id -> "good"/"werewolf"
-    witch_potions: Dict[str, bool] = {"heal": True, "poison": True}
+    seer_checks: Dict[int, str] = Field(default_factory=dict)  # player_id -> "good"/"werewolf"
+    heal_available: bool = True
+    poison_available: bool = True
     hunter_can_shoot: bool = True
     
     class Config:
@@ -59,6 +61,23 @@ class Player(BaseModel):
     def kill(self):
         self.status = PlayerStatus.DEAD
     
+    @property
+    def witch_potions(self) -> Mapping[str, bool]:
+        """Read-only view of the remaining witch potions; use use_heal_potion/use_poison_potion to change them"""
+        return MappingProxyType({"heal": self.heal_available, "poison": self.poison_available})
+    
+    def has_heal_potion(self) -> bool:
+        return self.heal_available
+    
+    def has_poison_potion(self) -> bool:
+        return self.poison_available
+    
+    def use_heal_potion(self):
+        self.heal_available = False
+    
+    def use_poison_potion(self):
+        self.poison_available = False
+    
     def get_role_description(self) -> str:
         role_desc = {
             Role.WEREWOLF: "狼人 - 每晚可以杀人",
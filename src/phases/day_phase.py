@@ -21,8 +21,9 @@ class DayPhase:
         # 2. Handle last words (if applicable)
         last_words = self._handle_last_words(night_deaths)
         
-        # Store last words in game state for context access
-        self.game_state.last_words_context = last_words
+        # Store last words in game state for context access (validated once here)
+        for last_word in self.game_state.set_last_words_context(last_words):
+            print(f"😒遗言 - {last_word['name']}({last_word['player']}): {last_word['speech']}")
         
         # 3. Day discussion
         discussion = self._day_discussion(night_deaths)
@@ -1,5 +1,6 @@
 from typing import List, Dict, Any
 from ..models.player import Player, Role
+from ..models.llm_player import LLMRequestError
 from ..game.game_state import GameState
 
 
@@ -13,12 +14,12 @@ class MVPPhase:
         print("所有存活和已死亡的玩家将投票选出本局游戏的MVP")
         
         all_players = self.game_state.players
-        alive_players = [p for p in all_players if p.is_alive()]
-        dead_players = [p for p in all_players if not p.is_alive()]
+        alive_players = self.game_state.get_alive_players()
+        dead_players = self.game_state.get_dead_players()
         
         # Available candidates are all players
         candidates = [p.id for p in all_players]
-        candidate_names = {p.id: p.name for p in all_players}
+        candidate_names = self.game_state.get_player_names()
         
         # Collect votes from all players
         votes = {}
@@ -47,7 +48,11 @@ class MVPPhase:
             请直接回复你要投票的玩家ID（1-10之间的数字），并简要说明理由。
             """
             
-            response = voter.send_message(prompt, context)
+            try:
+                response = voter.send_message(prompt, context)
+            except LLMRequestError as e:
+                print(f"⚠️ {voter.name}({voter.id}) MVP投票请求失败：{e}")
+                response = ""
             
             # Parse vote from response
             import re
@@ -89,14 +94,14 @@ class MVPPhase:
         
         if len(mvps) == 1:
             mvp_id = mvps[0]
-            mvp_player = next(p for p in all_players if p.id == mvp_id)
+            mvp_player = self.game_state.get_player_by_id(mvp_id)
             mvp_name = mvp_player.name
             mvp_role = mvp_player.role.value
             is_tie = False
         else:
             # In case of tie, choose the first one
             mvp_id = mvps[0]
-            mvp_player = next(p for p in all_players if p.id == mvp_id)
+            mvp_player = self.game_state.get_player_by_id(mvp_id)
             mvp_name = mvp_player.name
             mvp_role = mvp_player.role.value
             is_tie = True
@@ -137,9 +142,8 @@ class MVPPhase:
     
     def _get_game_summary_for_mvp(self) -> str:
         """Get game summary for MVP voting"""
-        all_players = self.game_state.players
-        alive_players = [p for p in all_players if p.is_alive()]
-        dead_players = [p for p in all_players if not p.is_alive()]
+        alive_players = self.game_state.get_alive_players()
+        dead_players = self.game_state.get_dead_players()
         
         summary = f"""
         游戏总结：
@@ -283,10 +283,10 @@ class NightPhase:
                 if (target_int is not None and 
                     wolf_target_int is not None and 
                     target_int == wolf_target_int and 
-                    witch.witch_potions["heal"]):
+                    witch.has_heal_potion()):
                     
                     # 立即更新状态，确保同步
-                    witch.witch_potions["heal"] = False
+                    witch.use_heal_potion()
                     self.game_state.witch_heal_used = True
                     
                     print(f"🧙‍♀️ 女巫 {witch.name}({witch.id}) 使用解药救了 {target_int}")
@@ -299,7 +299,7 @@ class NightPhase:
                         "action": "heal"
                     }
                 else:
-                    print(f"🔍 DEBUG: 女巫解药使用失败 - target: {target_int}, wolf_target: {wolf_target_int}, potion_available: {witch.witch_potions['heal']}")
+                    print(f"🔍 DEBUG: 女巫解药使用失败 - target: {target_int}, wolf_target: {wolf_target_int}, potion_available: {witch.has_heal_potion()}")
                     
             except (ValueError, TypeError) as e:
                 print(f"🔍 DEBUG: 女巫解药类型转换错误: {e}")
@@ -308,8 +308,8 @@ class NightPhase:
             target = action.get("target")
             target_player = self.game_state.get_player_by_id(target)
             
-            if target_player and target_player.is_alive() and witch.witch_potions["poison"]:
-                witch.witch_potions["poison"] = False
+            if target_player and target_player.is_alive() and witch.has_poison_potion():
+                witch.use_poison_potion()
                 self.game_state.witch_poison_used = True
                 
                 print(f"🧙‍♀️☠️ 女巫 {witch.name}({witch.id}) 使用毒药毒死了 {target_player.name}({target})")
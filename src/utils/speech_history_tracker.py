@@ -510,6 +510,24 @@ class SpeechHistoryTracker:
         
         return len(self._player_speech_index.get(player_id, []))
     
+    def get_speech_counts(self) -> Dict[int, int]:
+        """
+        Get speech counts for every player that has spoken.
+        
+        Returns:
+            Mapping of player ID to number of speeches
+        """
+        return {player_id: len(indices) for player_id, indices in self._player_speech_index.items()}
+    
+    def get_round_speech_counts(self) -> Dict[int, int]:
+        """
+        Get speech counts for every round that has speeches.
+        
+        Returns:
+            Mapping of round number to number of speeches
+        """
+        return {round_num: len(indices) for round_num, indices in self._round_speech_index.items()}
+    
     def _update_player_index(self, player_id: int, record_index: int) -> None:
         """Update the player speech index."""
         if player_id not in self._player_speech_index: